@@ -7,32 +7,419 @@ A desktop application for interacting with OllamaVision through SwarmUI API
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import requests
-import base64
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    # SIMD base64, much faster on large images; encodes straight to str without a bytes copy
+    from pybase64 import b64encode as _b64encode, b64encode_as_string as _b64encode_str
+except ImportError:
+    from base64 import b64encode as _b64encode
+    
+    def _b64encode_str(data):
+        return _b64encode(data).decode('ascii')
 import json
+try:
+    import orjson  # C JSON codec, much faster on large payloads and model lists
+except ImportError:
+    orjson = None
+import hashlib
+import itertools
+import logging
+import mmap
 import os
+import functools
 import threading
+import time
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-import webbrowser
-from PIL import Image, ImageTk
+from PIL import Image
 import io
-import uuid
-import time
+
+if orjson:
+    def _json_dumps(obj, indent=False, sort_keys=False):
+        """Serialize obj to JSON bytes"""
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+    
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj, indent=False, sort_keys=False):
+        """Serialize obj to JSON bytes"""
+        return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys).encode()
+    
+    _json_loads = json.loads
+
+if orjson and hasattr(orjson, "Fragment"):
+    @functools.lru_cache(maxsize=8)
+    def _json_text(text):
+        """Pre-encode a large string that is sent repeatedly so _json_dumps splices it in as-is"""
+        return orjson.Fragment(orjson.dumps(text))
+else:
+    def _json_text(text):
+        """Strings are encoded per request without orjson.Fragment (orjson 3.9+)"""
+        return text
+
+logger = logging.getLogger("ollamavision")
+
+# Image preview canvas size, and the largest preview drawn on it (leaving a margin)
+CANVAS_W, CANVAS_H = 400, 300
+PREVIEW_SIZE = (CANVAS_W - 20, CANVAS_H - 20)
+
+# Preview thumbnails are cached here across runs
+THUMBNAIL_CACHE_DIR = Path.home() / ".cache" / "ollamavision" / "thumbs"
+
+# The thumbnail cache is pruned back to this many files, least recently used first, at startup
+# and after every THUMBNAIL_PRUNE_INTERVAL new thumbnails
+THUMBNAIL_CACHE_MAX_FILES = 2000
+THUMBNAIL_PRUNE_INTERVAL = 200
+_thumbnail_writes = itertools.count(1)
+
+# File extensions picked up by batch processing
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'})
+
+# MIME types for image files sent to the API as-is
+IMAGE_MIME_TYPES = {
+    '.jpg': "image/jpeg",
+    '.jpeg': "image/jpeg",
+    '.png': "image/png",
+    '.gif': "image/gif",
+    '.webp': "image/webp"
+}
+
+# Formats vision backends don't accept; these are re-encoded as JPEG before upload
+TRANSCODE_EXTENSIONS = frozenset({'.bmp', '.tif', '.tiff'})
+
+# Backends that authenticate with an API key rather than a local URL
+API_KEY_BACKENDS = frozenset({"openai", "openrouter"})
+
+# Batch images larger than this (in pixels, either side) are downscaled before upload
+BATCH_MAX_DIMENSION = 2048
+
+# Prompts used when captioning images in batch mode. Batch captioning sends one AnalyzeImageAsync
+# request per image instead of handing the folder to SwarmUI's BatchCaptionImagesAsync, so these
+# client-side prompts replace SwarmUI's own caption-style prompts and captions may read differently
+CAPTION_STYLE_PROMPTS = {
+    "Danbooru Tags": "Describe this image as a comma-separated list of Danbooru-style tags. "
+                     "Respond only with the tags.",
+    "Simple Description": "Describe this image in one or two concise sentences. "
+                          "Respond only with the description.",
+    "Detailed Analysis": "Describe this image in detail, covering the subject, setting, composition, "
+                         "lighting and style. Respond only with the description."
+}
+
+# System prompt for turning a single image into a Wan image-to-video prompt
+WAN_I2V_SYSTEM_PROMPT = (
+    "You are a movie director. You can take a single image and turn it into a full thought out scene. "
+    "Instead of screenplays you write video generation prompts for image to video. You don't need to describe the image. "
+    "Just analyze the image and describe a scene with motion and camera movements based on the image given to you. "
+    "The user may give a short prompt for direction. Enhance that prompt and flesh out the users idea. Don't be vague. "
+    "Describe action and movement don't' just say \"moves, runs, walks\" give action words to the action itself. "
+    "Do not describe sounds as the video will not have sound. Mention things in the image but there is no need to describe them. "
+    "If you want a man in a green shirt that is in the image to move simply say something like this example shows: "
+    "\"the man in the green shirt begins to walk briskly...\". Begin your prompt with what the image shows. "
+    "The image sent to you will be the first frame of the video so you should make your prompt with this in mind. "
+    "Do not begin the scene with anything other than the image sent to you. Take the first frame image and expand from that. "
+    "The video will be on average about 5 seconds in length. Make your prompt fit within this constraint. "
+    "Do not make the prompt so long that it can't fit into a 5 second video clip. Be descriptive but concise. "
+    "Don't use phrasing like \"the camera pivots behind a hovering helicopter\" instead say \"the camera pivots behind the hovering helicopter\" "
+    "use what's in the image to build the prompt.\n\n"
+    "Return only the prompt you make from the image. Do not explain yourself or give any extra information other than the prompt you make from the image. "
+    "Do not describe the image or give any information about the image other than the video prompt. The prompt should not include any description of the image.")
+
+# System prompts for the Enhance Text tab, keyed by enhancement type
+QWEN_ENHANCE_SYSTEM_PROMPT = """# Qwen Prompt Enhancement System
+
+You are an expert prompt enhancement specialist designed to transform brief, basic prompts into rich, detailed, and comprehensive instructions that will produce superior results from AI image generation models.
+
+## Core Function
+
+Your primary role is to receive short, simple prompts from users and expand them into fully-fleshed, detailed prompts that include:
+- Rich visual descriptions
+- Technical specifications
+- Artistic direction
+- Contextual details
+- Quality enhancers
+- Style specifications
+
+## Enhancement Framework
+
+### Visual Detail Expansion
+**Transform basic subjects into rich descriptions:**
+- Simple: "a cat" 
+- Enhanced: "a majestic Maine Coon cat with luxurious silver-gray fur, piercing amber eyes, sitting regally with perfect posture, whiskers catching soft light"
+
+**Add environmental context:**
+- Specify lighting conditions (golden hour, studio lighting, natural daylight, dramatic shadows)
+- Include atmospheric elements (mist, rain, snow, dust particles, lens flares)
+- Describe backgrounds and settings in detail
+- Add weather and seasonal indicators
+
+### Technical Quality Specifications
+Always include technical parameters to ensure high-quality output:
+- **Resolution indicators:** "8K resolution," "ultra high definition," "crisp detail"
+- **Camera specifications:** "shot with professional DSLR," "50mm lens," "shallow depth of field"
+- **Lighting setup:** "three-point lighting," "soft box lighting," "natural window light"
+- **Composition rules:** "rule of thirds," "centered composition," "dynamic angle"
+
+### Artistic Style Integration
+Enhance prompts with specific artistic directions:
+- **Photography styles:** portrait, landscape, macro, street photography, documentary
+- **Artistic movements:** impressionistic, photorealistic, surreal, minimalist, baroque
+- **Color palettes:** warm tones, cool blues, monochromatic, vibrant saturated colors
+- **Mood descriptors:** serene, dramatic, mysterious, energetic, melancholic
+
+### Quality Enhancement Keywords
+Include power words that improve AI generation:
+- **Clarity enhancers:** "sharp focus," "crystal clear," "highly detailed," "intricate"
+- **Professional markers:** "award-winning," "masterpiece," "professional grade," "gallery quality"
+- **Texture descriptors:** "smooth," "rough," "glossy," "matte," "textured surface"
+- **Depth indicators:** "bokeh background," "layered composition," "foreground and background separation"
+
+## Enhancement Process
+
+### Step 1: Subject Analysis
+- Identify the core subject or concept
+- Determine the likely intent (artistic, commercial, documentary, etc.)
+- Assess what visual elements would enhance the concept
+
+### Step 2: Context Building
+- Add relevant environmental details
+- Include time of day/season if appropriate
+- Specify location or setting characteristics
+- Consider cultural or historical context
+
+### Step 3: Technical Specification
+- Add camera and lens specifications
+- Include lighting setup details
+- Specify composition guidelines
+- Add quality and resolution markers
+
+### Step 4: Artistic Direction
+- Define visual style and aesthetic
+- Add color palette guidance
+- Include mood and atmosphere descriptors
+- Specify any artistic influences or techniques
+
+### Step 5: Quality Assurance
+- Include professional quality indicators
+- Add detail enhancement keywords
+- Specify any technical perfection requirements
+- Include output format preferences
+
+## Enhancement Examples
+
+**Basic Prompt:** "sunset over mountains"
+**Enhanced Prompt:** "Breathtaking golden hour sunset over majestic snow-capped mountain peaks, dramatic cloud formations painted in brilliant oranges, purples, and magentas, alpine landscape with pristine lakes reflecting the colorful sky, shot with telephoto lens creating compressed perspective, professional landscape photography, award-winning composition following rule of thirds, crystal clear 8K detail, HDR lighting capturing full dynamic range, serene and awe-inspiring atmosphere"
+
+**Basic Prompt:** "woman reading"
+**Enhanced Prompt:** "Elegant woman in her thirties with flowing auburn hair, wearing a cream-colored cashmere sweater, peacefully reading a leather-bound book in a cozy library corner, warm afternoon sunlight streaming through tall windows creating gentle shadows, surrounded by towering mahogany bookshelves filled with classic literature, shot with 85mm portrait lens, shallow depth of field with beautiful bokeh, soft natural lighting, intimate and contemplative mood, photorealistic detail, professional portraiture style"
+
+## Output Format Requirements
+
+Structure enhanced prompts as single, flowing descriptions that include:
+1. **Main Subject** (detailed description)
+2. **Setting/Environment** (contextual details)
+3. **Lighting/Atmosphere** (mood and technical lighting)
+4. **Technical Specifications** (camera, quality, resolution)
+5. **Artistic Style** (aesthetic direction and mood)
+6. **Quality Enhancers** (professional markers and detail specifications)
+
+## Key Enhancement Principles
+
+### Specificity Over Generality
+- Replace vague terms with precise descriptors
+- Add measurable qualities (colors, sizes, textures)
+- Include specific rather than generic elements
+
+### Visual Richness
+- Layer multiple descriptive elements
+- Include sensory details that translate visually
+- Add elements that create depth and interest
+
+### Professional Standards
+- Include industry-standard terminology
+- Add technical specifications that matter
+- Reference professional photography/art concepts
+
+### Contextual Relevance
+- Ensure all additions serve the core concept
+- Maintain logical consistency throughout
+- Balance detail with focus on the main subject
+
+## Response Guidelines
+
+- Always expand significantly on the original prompt
+- Maintain the user's original intent while enriching it
+- Provide prompts that are immediately usable for image generation
+- Include diverse enhancement elements in every response
+- Structure the enhanced prompt for optimal AI interpretation
+- Balance technical precision with creative inspiration
+- Only respong with the enhanced prompt, do not respond with anything like "here is your enhanced prompt" or any other description"""
+
+WAN_ENHANCE_SYSTEM_PROMPT = """You are a motion prompt enhancement assistant for WAN 2.2 video generation. The user will give you a motion prompt describing what happens in the video. Do not add new elements or change the actions, characters, or events. Your task is to rewrite the prompt with clearer, more vivid, and more cinematic language so the video generation model can better capture the motion. Focus on fluidity, atmosphere, and visual clarity. Keep the sequence of actions identical to the user's original prompt. Respond only with the enhanced motion prompt—no explanations, lists, or meta commentary
+
+Now enhance the following motion prompt:"""
+
+ENHANCE_SYSTEM_PROMPTS = {
+    "qwen": QWEN_ENHANCE_SYSTEM_PROMPT,
+    "wan": WAN_ENHANCE_SYSTEM_PROMPT
+}
+
+@dataclass
+class APIResult:
+    """Outcome of an image analysis, text enhancement or batch run"""
+    success: bool
+    response: str = ""
+    message: str = ""
+    processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    
+    @classmethod
+    def from_response(cls, data):
+        """Build a result from a SwarmUI API response"""
+        return cls(success=bool(data.get("success")),
+                   response=data.get("response") or "",
+                   message=data.get("message") or data.get("error") or "")
 
 class OllamaVisionAPI:
     """API client for SwarmUI OllamaVision extension"""
     
+    # Connections kept open to SwarmUI; also caps concurrent SwarmUI requests
+    SWARMUI_POOL_SIZE = 8
+    
+    # Seconds to wait for a TCP connection, so dead hosts fail fast even with long read timeouts
+    CONNECT_TIMEOUT = 3
+    
+    # Files are base64-encoded in chunks of this size; a multiple of 3 so no padding lands mid-stream
+    B64_CHUNK_SIZE = 48 * 1024
+    
+    # Files at least this large are memory-mapped and encoded in one pass instead of read in chunks
+    MMAP_MIN_SIZE = 64 * 1024
+    
+    # Seconds a fetched remote model list is reused before it is fetched again
+    MODEL_CACHE_TTL = 300
+    
+    # Backend-specific request fields, keyed by backend type
+    BACKEND_FIELDS = {
+        "ollama": lambda ollama_url, api_key, site_name: {"ollamaUrl": ollama_url},
+        "openai": lambda ollama_url, api_key, site_name: {"apiKey": api_key},
+        "openrouter": lambda ollama_url, api_key, site_name: {"apiKey": api_key, "siteName": site_name},
+    }
+    
     def __init__(self, base_url="http://localhost:7801"):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {"Content-Type": "application/json"}
         self.session_id = None
+        
+        # Reuse pooled keep-alive connections for every call
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
+        # Shared by every adapter mounted below, since the most specific mount wins per URL
+        self._retry = Retry(total=2, backoff_factor=0.2)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=self._retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Separate warm pools for the remote model-list hosts
+        self.session.mount("https://api.openai.com", HTTPAdapter(pool_maxsize=4, max_retries=self._retry))
+        self.session.mount("https://openrouter.ai", HTTPAdapter(pool_maxsize=4, max_retries=self._retry))
+        
+        self._base_url = None
+        self.base_url = base_url
+        
+        # Never run more requests at once than the SwarmUI pool can hold
+        self._request_slots = threading.BoundedSemaphore(self.SWARMUI_POOL_SIZE)
+        
+        # Remote model lists as (expiry, models), keyed by (provider, API key hash)
+        self._model_cache = {}
+    
+    @property
+    def base_url(self):
+        """SwarmUI base URL"""
+        return self._base_url
+    
+    @base_url.setter
+    def base_url(self, value):
+        """Set the SwarmUI base URL and give it its own connection pool"""
+        value = value.rstrip('/')
+        if value == self._base_url:
+            # Keep the warm pool, which other threads may be using right now
+            return
+        if self._base_url:
+            old_adapter = self.session.adapters.pop(self._base_url + "/", None)
+            if old_adapter:
+                old_adapter.close()
+        self._base_url = value
+        self.session.mount(self._base_url + "/",
+                           HTTPAdapter(pool_maxsize=self.SWARMUI_POOL_SIZE, max_retries=self._retry))
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self.session.close()
+    
+    @staticmethod
+    def _encode_file_b64(path, size=None, prefix=""):
+        """Base64-encode a file's raw bytes without decoding the image, after an ASCII prefix"""
+        step = OllamaVisionAPI.B64_CHUNK_SIZE
+        with open(path, 'rb') as f:
+            if size is None:
+                # Size the open file rather than looking the path up again
+                size = os.fstat(f.fileno()).st_size
+            
+            # Encode chunk by chunk into one buffer sized for the prefix and the whole output,
+            # so neither the raw file nor a second copy of the result is ever built
+            encoded = bytearray(len(prefix) + (size + 2) // 3 * 4)
+            encoded[:len(prefix)] = prefix.encode('ascii')
+            pos = len(prefix)
+            
+            if size >= OllamaVisionAPI.MMAP_MIN_SIZE:
+                # Encode straight from the mapped file instead of copying it through a read buffer first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    for start in range(0, len(view), step):
+                        piece = _b64encode(view[start:start + step])
+                        encoded[pos:pos + len(piece)] = piece
+                        pos += len(piece)
+            else:
+                chunk = bytearray(step)
+                view = memoryview(chunk)
+                while True:
+                    n = f.readinto(chunk)
+                    if not n:
+                        break
+                    piece = _b64encode(view[:n])
+                    encoded[pos:pos + len(piece)] = piece
+                    pos += len(piece)
+        
+        # The file may have changed size since it was stat'ed
+        del encoded[pos:]
+        return encoded.decode('ascii')
+    
+    @staticmethod
+    def _model_cache_key(provider, api_key):
+        """Model cache key that doesn't keep the raw API key around"""
+        return (provider, hashlib.sha1((api_key or "").encode()).hexdigest())
+    
+    def _get_cached_models(self, cache_key):
+        """Return a copy of a cached model list, or None if missing or expired"""
+        entry = self._model_cache.get(cache_key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return list(entry[1])
+    
+    def _cache_models(self, cache_key, models):
+        """Remember a fetched model list for MODEL_CACHE_TTL seconds"""
+        self._model_cache[cache_key] = (time.monotonic() + self.MODEL_CACHE_TTL, models)
     
     def get_swarmui_session(self):
         """Get a new session ID from SwarmUI"""
         try:
             url = f"{self.base_url}/API/GetNewSession"
-            response = requests.post(url, headers=self.headers, json={}, timeout=60)
+            response = self.session.post(url, json={}, timeout=(self.CONNECT_TIMEOUT, 60))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if "session_id" in data:
                 self.session_id = data["session_id"]
@@ -40,7 +427,7 @@ class OllamaVisionAPI:
             else:
                 return {"success": False, "message": "No session_id in response"}
                 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             return {"success": False, "message": f"Failed to get SwarmUI session: {str(e)}"}
     
     def get_session_id(self):
@@ -59,18 +446,27 @@ class OllamaVisionAPI:
         """Make a request to the OllamaVision API"""
         url = f"{self.base_url}/API/{endpoint}"
         
-        # Add session ID to all API calls if available
-        data_with_session = data.copy()
+        # Add session ID to all API calls if available (shallow merge, caller's dict is untouched)
         if self.session_id:
-            data_with_session["session_id"] = self.session_id  # SwarmUI expects "session_id" not "sessionId"
+            data = {**data, "session_id": self.session_id}  # SwarmUI expects "session_id" not "sessionId"
+        
+        # Serialize once and send the bytes as-is
+        body = _json_dumps(data)
         
         try:
-            response = requests.post(url, headers=self.headers, json=data_with_session, timeout=120)
+            with self._request_slots:
+                response = self.session.post(url, data=body, timeout=(self.CONNECT_TIMEOUT, 120))
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return _json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             raise Exception(f"API request failed: {str(e)}")
     
+    def _add_backend_fields(self, data, backend_type, ollama_url, api_key, site_name):
+        """Add the connection fields the given backend needs to a request"""
+        build = self.BACKEND_FIELDS.get(backend_type)
+        if build:
+            data.update(build(ollama_url, api_key, site_name))
+    
     def connect_ollama(self, ollama_url="http://localhost:11434", show_all=False):
         """Connect to Ollama and get available models"""
         return self.make_request("ConnectToOllamaAsync", {
@@ -99,41 +495,11 @@ class OllamaVisionAPI:
         
         # Add system prompt if provided
         if system_prompt:
-            data["systemPrompt"] = system_prompt
-        
-        if backend_type == "ollama":
-            data["ollamaUrl"] = ollama_url
-        elif backend_type in ["openai", "openrouter"]:
-            data["apiKey"] = api_key
-            if backend_type == "openrouter":
-                data["siteName"] = site_name
-        
-        return self.make_request("AnalyzeImageAsync", data)
-    
-    def batch_caption_images(self, folder_path, model, backend_type="ollama", 
-                           caption_style="Danbooru Tags", trigger_word="", 
-                           temperature=0.8, max_tokens=500, ollama_url="http://localhost:11434",
-                           api_key=None, site_name="SwarmUI"):
-        """Batch caption multiple images"""
-        data = {
-            "folderPath": folder_path,
-            "model": model,
-            "backendType": backend_type,
-            "captionStyle": caption_style,
-            "triggerWord": trigger_word,
-            "temperature": temperature,
-            "maxTokens": max_tokens
-        }
+            data["systemPrompt"] = _json_text(system_prompt)
         
-        if backend_type == "ollama":
-            data["ollamaUrl"] = ollama_url
-        elif backend_type in ["openai", "openrouter"]:
-            data["apiKey"] = api_key
-            if backend_type == "openrouter":
-                data["siteName"] = site_name
+        self._add_backend_fields(data, backend_type, ollama_url, api_key, site_name)
         
-        return self.make_request("BatchCaptionImagesAsync", data)
-    
+        return APIResult.from_response(self.make_request("AnalyzeImageAsync", data))
     
     def enhance_text_prompt(self, model, backend_type="ollama", prompt="", 
                            temperature=0.8, max_tokens=500, ollama_url="http://localhost:11434",
@@ -148,27 +514,24 @@ class OllamaVisionAPI:
         }
         
         if system_prompt:
-            data["systemPrompt"] = system_prompt
+            data["systemPrompt"] = _json_text(system_prompt)
         
-        if backend_type == "ollama":
-            data["ollamaUrl"] = ollama_url
-        elif backend_type in ["openai", "openrouter"]:
-            data["apiKey"] = api_key
-            if backend_type == "openrouter":
-                data["siteName"] = site_name
+        self._add_backend_fields(data, backend_type, ollama_url, api_key, site_name)
         
-        return self.make_request("EnhanceTextPromptAsync", data)
+        return APIResult.from_response(self.make_request("EnhanceTextPromptAsync", data))
     
     def get_openai_models(self, api_key):
         """Get available models from OpenAI API"""
+        cache_key = self._model_cache_key("openai", api_key)
+        cached = self._get_cached_models(cache_key)
+        if cached is not None:
+            return {"success": True, "models": cached}
+        
         try:
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
-            response = requests.get("https://api.openai.com/v1/models", headers=headers, timeout=60)
+            headers = {"Authorization": f"Bearer {api_key}"}
+            response = self.session.get("https://api.openai.com/v1/models", headers=headers, timeout=(self.CONNECT_TIMEOUT, 60))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Return ALL available models from OpenAI (no filtering)
             all_models = []
@@ -177,20 +540,23 @@ class OllamaVisionAPI:
                 if model_id:  # Only include models with valid IDs
                     all_models.append(model_id)
             
-            return {"success": True, "models": all_models}
-        except requests.exceptions.RequestException as e:
+            self._cache_models(cache_key, all_models)
+            return {"success": True, "models": list(all_models)}
+        except (requests.exceptions.RequestException, ValueError) as e:
             return {"success": False, "message": f"Failed to fetch OpenAI models: {str(e)}"}
     
     def get_openrouter_models(self, api_key):
         """Get available models from OpenRouter API"""
+        cache_key = self._model_cache_key("openrouter", api_key)
+        cached = self._get_cached_models(cache_key)
+        if cached is not None:
+            return {"success": True, "models": cached}
+        
         try:
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
-            response = requests.get("https://openrouter.ai/api/v1/models", headers=headers, timeout=60)
+            headers = {"Authorization": f"Bearer {api_key}"}
+            response = self.session.get("https://openrouter.ai/api/v1/models", headers=headers, timeout=(self.CONNECT_TIMEOUT, 60))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Return ALL available models from OpenRouter (no filtering)
             all_models = []
@@ -199,13 +565,25 @@ class OllamaVisionAPI:
                 if model_id:  # Only include models with valid IDs
                     all_models.append(model_id)
             
-            return {"success": True, "models": all_models}
-        except requests.exceptions.RequestException as e:
+            self._cache_models(cache_key, all_models)
+            return {"success": True, "models": list(all_models)}
+        except (requests.exceptions.RequestException, ValueError) as e:
             return {"success": False, "message": f"Failed to fetch OpenRouter models: {str(e)}"}
 
 class OllamaVisionGUI:
     """Main GUI application"""
     
+    SETTINGS_FILE = "ollamavision_settings.json"
+    
+    # Batch progress is redrawn at most this often (~30 Hz)
+    PROGRESS_INTERVAL_MS = 33
+    
+    # Number of encoded images kept for re-analysis
+    DATA_URI_CACHE_SIZE = 8
+    
+    # Times each batch image is tried before it is counted as failed
+    BATCH_ATTEMPTS = 2
+    
     def __init__(self, root):
         self.root = root
         self.root.title("OllamaVision GUI")
@@ -218,10 +596,32 @@ class OllamaVisionGUI:
         # API client
         self.api = OllamaVisionAPI()
         
+        # Worker pool for blocking HTTP calls
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ova-io")
+        
+        # Set on close; workers stop starting new work and stop posting to the (destroyed) UI
+        self._stop_event = threading.Event()
+        
+        # Image decoding runs off the Tk thread; only the newest preview request is kept
+        self._preview_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                                thread_name_prefix="ova-preview")
+        self._preview_future = None
+        self._preview_pool.submit(self._prune_thumbnail_cache)
+        
+        # Batch workers post progress here; the Tk thread drains it on a timer
+        self._progress_queue = queue.Queue()
+        self._batch_future = None
+        self._batch_image_futures = ()
+        self._progress_after_id = None
+        
         # Variables
         self.current_image = None
         self.current_image_data = None
-        self.available_models = []
+        self._encode_buffers = threading.local()  # Reused JPEG buffers per thread
+        
+        # Recently built image data URIs, keyed by (path, mtime, size); shared by worker threads
+        self._data_uri_cache = OrderedDict()
+        self._data_uri_lock = threading.Lock()
         self.batch_results = []
         
         # API key storage for different backends
@@ -234,10 +634,17 @@ class OllamaVisionGUI:
         
         # Connection state
         self.is_connected = False
+        self._load_gen = 0  # Bumped per connect/disconnect so stale results are ignored
+        self._spinner_after_id = None
         
         # Model filtering
         self.all_models = []  # Store all models for filtering
         self.filtered_models = []  # Store filtered models
+        self._models_lower = []  # Lowercased all_models, for case-insensitive search
+        self._filtered_lower = []  # Lowercased filtered_models
+        self._last_search = ""  # Search text filtered_models was built from
+        self._filter_after_id = None  # Pending debounced search
+        self._prefetch_after_id = None  # Pending debounced model list prefetch
         
         # Global model settings (persistent across all tabs)
         self.temperature_var = tk.DoubleVar(value=0.8)
@@ -251,18 +658,109 @@ class OllamaVisionGUI:
         self.min_p_var = tk.DoubleVar(value=0.0)
         self.top_a_var = tk.DoubleVar(value=0.0)
         
+        # Snapshot of the parameters sent with each request, dropped whenever one is edited
+        self._model_params = None
+        for var in (self.temperature_var, self.max_tokens_var):
+            var.trace_add("write", self._invalidate_model_params)
+        
+        # Summary of the current settings shown on each tab, re-formatted only when they change
+        self.settings_info_var = tk.StringVar()
+        for var in (self.temperature_var, self.max_tokens_var):
+            var.trace_add("write", self._refresh_settings_info)
+        self._refresh_settings_info()
+        
         # Application settings
         self.default_model_var = tk.StringVar()
         
-        # Wan I2V Enhancement
-        self.wan_i2v_var = tk.BooleanVar(value=False)
+        # Single image tab
+        self.prompt_var = tk.StringVar(value="Describe this image in detail")
+        self.wan_i2v_var = tk.BooleanVar(value=False)  # Wan I2V Enhancement
+        self.single_image_model_var = tk.StringVar(value="None selected")
+        self.image_path_var = tk.StringVar()
+        
+        # Batch processing tab
+        self.folder_path_var = tk.StringVar()
+        self.caption_style_var = tk.StringVar(value="Danbooru Tags")
+        self.trigger_word_var = tk.StringVar(value="1girl")
+        self.batch_concurrency_var = tk.IntVar(value=4)
+        self.batch_model_var = tk.StringVar(value="None selected")
+        self.progress_var = tk.DoubleVar()
+        self.progress_counter_var = tk.StringVar(value="Ready to process")
+        self.progress_label_var = tk.StringVar(value="Ready")
+        
+        # Text enhancement tab
+        self.enhancement_type_var = tk.StringVar(value="qwen")
+        self.type_description_var = tk.StringVar(value="Qwen: General text enhancement for images")
+        self.text_model_var = tk.StringVar(value="None selected")
+        
+        # Live settings, and a copy of what was last read from or written to disk
+        self._settings = {}
+        self._settings_shadow = {}
+        self._save_after_id = None  # Pending debounced auto-save
         
         # Create GUI
         self.create_widgets()
+        
+        # Every label that mirrors the selected model, and the text they last showed
+        self._model_status_vars = (self.single_image_model_var, self.batch_model_var,
+                                   self.text_model_var, self.model_info_var)
+        self._last_model_status = None
+        
         self.load_settings()
         
         # Initialize session ID display
         self.update_session_id_display()
+        
+        # Release pooled connections when the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """Clean up and close the application"""
+        # Write out an auto-save that is still waiting on its debounce
+        if self._save_after_id:
+            self.root.after_cancel(self._save_after_id)
+            self._flush_auto_save()
+        
+        # Pool threads aren't daemons, so stop queued work rather than letting it hold up exit
+        self._stop_event.set()
+        for future in self._batch_image_futures:
+            future.cancel()
+        for pool in (self.executor, self._preview_pool):
+            try:
+                pool.shutdown(wait=False, cancel_futures=True)
+            except TypeError:
+                # cancel_futures needs Python 3.9; queued jobs still bail out on the stop event
+                pool.shutdown(wait=False)
+        if self.api:
+            self.api.close()
+        self.root.destroy()
+    
+    def run_in_background(self, fn, *args, callback=None, error_prefix="Operation failed"):
+        """Run fn in the worker pool and hand its result to callback on the Tk thread"""
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(
+            lambda f: self._ui_call(self._on_result, f, callback, error_prefix))
+        return future
+    
+    def _ui_call(self, fn, *args):
+        """Run fn(*args) on the Tk thread, unless the window is closing"""
+        if self._stop_event.is_set():
+            return
+        try:
+            self.root.after(0, fn, *args)
+        except (RuntimeError, tk.TclError):
+            # The root was destroyed between the check and the call
+            pass
+    
+    def _on_result(self, future, callback, error_prefix):
+        """Deliver a finished background call to its UI callback"""
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"{error_prefix}: {str(e)}")
+            return
+        if callback:
+            callback(result)
     
     def setup_styles(self):
         """Configure modern styling for the application"""
@@ -279,6 +777,8 @@ class OllamaVisionGUI:
         style.configure('Success.TLabel', font=('Arial', 9), foreground='#27ae60')
         style.configure('Warning.TLabel', font=('Arial', 9), foreground='#f39c12')
         style.configure('Error.TLabel', font=('Arial', 9), foreground='#e74c3c')
+        style.configure('Hint.TLabel', foreground='gray')
+        style.configure('Icon.TLabel', font=('Arial', 14))
         
         # Button styles
         style.configure('Accent.TButton', font=('Arial', 10, 'bold'))
@@ -313,12 +813,28 @@ class OllamaVisionGUI:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         
-        # Create tabs
+        # Create tabs; only the connection tab is built up front
         self.create_connection_tab()
-        self.create_settings_tab()
-        self.create_single_image_tab()
-        self.create_batch_processing_tab()
-        self.create_text_enhancement_tab()
+        
+        # Other tabs get an empty frame now and are built on first selection;
+        # builders are keyed by the frame's Tk path, which is what select() returns
+        self._tab_builders = {}
+        for title, builder in (("⚙️ Model Settings", self.create_settings_tab),
+                               ("🖼️ Single Image", self.create_single_image_tab),
+                               ("📦 Batch Processing", self.create_batch_processing_tab),
+                               ("✨ Text Enhancement", self.create_text_enhancement_tab)):
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=title)
+            self._tab_builders[str(frame)] = (builder, frame)
+        
+        self.notebook.bind("<<NotebookTabChanged>>", self._maybe_build_tab)
+    
+    def _maybe_build_tab(self, event=None):
+        """Build the selected tab's widgets the first time it is shown"""
+        pending = self._tab_builders.pop(str(self.notebook.select()), None)
+        if pending:
+            builder, frame = pending
+            builder(frame)
     
     def create_connection_tab(self):
         """Create connection management tab"""
@@ -389,7 +905,7 @@ class OllamaVisionGUI:
         search_input_frame = ttk.Frame(search_section)
         search_input_frame.pack(fill=tk.X, pady=8)
         
-        ttk.Label(search_input_frame, text="🔍", font=("Arial", 14)).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Label(search_input_frame, text="🔍", style='Icon.TLabel').pack(side=tk.LEFT, padx=(0, 8))
         self.model_search_var = tk.StringVar()
         self.model_search_var.trace('w', self.filter_models)
         search_entry = ttk.Entry(search_input_frame, textvariable=self.model_search_var, 
@@ -461,10 +977,8 @@ class OllamaVisionGUI:
         # Bind selection
         self.models_listbox.bind('<<ListboxSelect>>', self.on_model_select)
     
-    def create_settings_tab(self):
+    def create_settings_tab(self, frame):
         """Create global model settings tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="⚙️ Model Settings")
         
         # Configure frame to expand
         frame.grid_rowconfigure(0, weight=1)
@@ -583,13 +1097,11 @@ These settings apply globally to all tabs and operations.
 • Frequency/Presence Penalty: OpenAI-specific penalties
 • Min P/Top A: Advanced sampling parameters
         """
-        info_label = ttk.Label(main_frame, text=info_text.strip(), justify=tk.LEFT, foreground="gray")
+        info_label = ttk.Label(main_frame, text=info_text.strip(), justify=tk.LEFT, style='Hint.TLabel')
         info_label.pack(pady=10)
     
-    def create_single_image_tab(self):
+    def create_single_image_tab(self, frame):
         """Create single image analysis tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="🖼️ Single Image")
         
         # Configure frame to expand
         frame.grid_rowconfigure(0, weight=1)
@@ -608,7 +1120,6 @@ These settings apply globally to all tabs and operations.
         prompt_section.pack(fill=tk.X, pady=(0, 10))
         
         ttk.Label(prompt_section, text="💬 Prompt:", style='Subtitle.TLabel').pack(anchor=tk.W, pady=(0, 8))
-        self.prompt_var = tk.StringVar(value="Describe this image in detail")
         prompt_entry = ttk.Entry(prompt_section, textvariable=self.prompt_var, width=60, style='Modern.TEntry')
         prompt_entry.pack(fill=tk.X, pady=(0, 10))
         
@@ -616,7 +1127,6 @@ These settings apply globally to all tabs and operations.
         enhancement_section = ttk.Frame(analysis_frame)
         enhancement_section.pack(fill=tk.X, pady=(0, 10))
         
-        self.wan_i2v_var = tk.BooleanVar()
         wan_checkbox = ttk.Checkbutton(enhancement_section, text="🎬 Use Wan I2V Enhancement", 
                                       variable=self.wan_i2v_var, command=self.on_wan_i2v_toggle)
         wan_checkbox.pack(anchor=tk.W, pady=(0, 5))
@@ -637,13 +1147,12 @@ These settings apply globally to all tabs and operations.
         model_info = ttk.Frame(info_section)
         model_info.pack(fill=tk.X, pady=(0, 5))
         ttk.Label(model_info, text="🤖 Selected Model:", style='Subtitle.TLabel').pack(side=tk.LEFT)
-        self.single_image_model_var = tk.StringVar(value="None selected")
         ttk.Label(model_info, textvariable=self.single_image_model_var, style='Info.TLabel').pack(side=tk.LEFT, padx=(10, 0))
         
         # Global settings info
         ttk.Label(info_section, text="⚙️ Model parameters are managed globally in the 'Model Settings' tab.", 
                  style='Info.TLabel').pack(anchor=tk.W, pady=(0, 5))
-        settings_info = ttk.Label(info_section, text=f"Current: Temp={self.temperature_var.get():.1f}, Max Tokens={self.max_tokens_var.get()}", 
+        settings_info = ttk.Label(info_section, textvariable=self.settings_info_var, 
                                  style='Info.TLabel')
         settings_info.pack(anchor=tk.W)
         
@@ -672,7 +1181,6 @@ These settings apply globally to all tabs and operations.
                                style='Primary.TButton', width=18)
         select_btn.pack(side=tk.LEFT, padx=(0, 15))
         
-        self.image_path_var = tk.StringVar()
         path_label = ttk.Label(top_section, textvariable=self.image_path_var, style='Info.TLabel')
         path_label.pack(side=tk.LEFT)
         
@@ -681,13 +1189,18 @@ These settings apply globally to all tabs and operations.
         preview_area.pack(fill=tk.X, pady=(0, 10))
         
         # Create a canvas for the image with fixed size
-        self.image_canvas = tk.Canvas(preview_area, width=400, height=300, 
+        self.image_canvas = tk.Canvas(preview_area, width=CANVAS_W, height=CANVAS_H, 
                                     bg="#f8f9fa", relief="solid", borderwidth=1)
         self.image_canvas.pack(pady=10)
         
-        # Show initial placeholder text on canvas
-        self.image_canvas.create_text(200, 150, text="No image selected", 
-                                    font=("Arial", 12), fill="gray", anchor=tk.CENTER)
+        # One image item and one placeholder text item, reconfigured for every preview
+        self._canvas_image_id = self.image_canvas.create_image(CANVAS_W // 2, CANVAS_H // 2, anchor=tk.CENTER)
+        self._canvas_text_id = self.image_canvas.create_text(CANVAS_W // 2, CANVAS_H // 2, text="No image selected", 
+                                                             font=("Arial", 12), fill="gray", anchor=tk.CENTER)
+        
+        # The displayed preview, and the previous one kept off-screen; a shown photo is never modified
+        self._front_photo = None
+        self._back_photo = None
         
         # Right side - Results display (takes remaining space)
         right_frame = ttk.LabelFrame(content_frame, text="📊 Analysis Results", padding=12)
@@ -712,10 +1225,8 @@ These settings apply globally to all tabs and operations.
             # Reset to default prompt when disabled
             self.prompt_var.set("Describe this image in detail")
     
-    def create_batch_processing_tab(self):
+    def create_batch_processing_tab(self, frame):
         """Create batch processing tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="📦 Batch Processing")
         
         # Configure frame to expand
         frame.grid_rowconfigure(0, weight=1)
@@ -736,7 +1247,6 @@ These settings apply globally to all tabs and operations.
                                style='Primary.TButton', width=18)
         select_btn.pack(side=tk.LEFT, padx=(0, 15))
         
-        self.folder_path_var = tk.StringVar()
         path_label = ttk.Label(folder_section, textvariable=self.folder_path_var, style='Info.TLabel')
         path_label.pack(side=tk.LEFT)
         
@@ -750,7 +1260,6 @@ These settings apply globally to all tabs and operations.
         
         # Caption style
         ttk.Label(settings_grid, text="🎨 Caption Style:", style='Subtitle.TLabel').grid(row=0, column=0, sticky=tk.W, padx=8, pady=8)
-        self.caption_style_var = tk.StringVar(value="Danbooru Tags")
         caption_combo = ttk.Combobox(settings_grid, textvariable=self.caption_style_var,
                                    values=["Danbooru Tags", "Simple Description", "Detailed Analysis"],
                                    state="readonly", width=25, style='Modern.TCombobox')
@@ -758,10 +1267,15 @@ These settings apply globally to all tabs and operations.
         
         # Trigger word
         ttk.Label(settings_grid, text="🔤 Trigger Word:", style='Subtitle.TLabel').grid(row=1, column=0, sticky=tk.W, padx=8, pady=8)
-        self.trigger_word_var = tk.StringVar(value="1girl")
         trigger_entry = ttk.Entry(settings_grid, textvariable=self.trigger_word_var, width=25, style='Modern.TEntry')
         trigger_entry.grid(row=1, column=1, sticky=tk.W, padx=8, pady=8)
         
+        # Parallel requests
+        ttk.Label(settings_grid, text="⚡ Parallel Requests:", style='Subtitle.TLabel').grid(row=2, column=0, sticky=tk.W, padx=8, pady=8)
+        concurrency_spin = ttk.Spinbox(settings_grid, from_=1, to=OllamaVisionAPI.SWARMUI_POOL_SIZE,
+                                       textvariable=self.batch_concurrency_var, width=6)
+        concurrency_spin.grid(row=2, column=1, sticky=tk.W, padx=8, pady=8)
+        
         # Model status and settings info
         info_section = ttk.Frame(batch_frame)
         info_section.pack(fill=tk.X, pady=(0, 10))
@@ -770,13 +1284,12 @@ These settings apply globally to all tabs and operations.
         model_info = ttk.Frame(info_section)
         model_info.pack(fill=tk.X, pady=(0, 8))
         ttk.Label(model_info, text="🤖 Selected Model:", style='Subtitle.TLabel').pack(side=tk.LEFT)
-        self.batch_model_var = tk.StringVar(value="None selected")
         ttk.Label(model_info, textvariable=self.batch_model_var, style='Info.TLabel').pack(side=tk.LEFT, padx=(10, 0))
         
         # Global settings info
         ttk.Label(info_section, text="⚙️ Model parameters are managed globally in the 'Model Settings' tab.", 
                  style='Info.TLabel').pack(anchor=tk.W, pady=(0, 5))
-        settings_info = ttk.Label(info_section, text=f"Current: Temp={self.temperature_var.get():.1f}, Max Tokens={self.max_tokens_var.get()}", 
+        settings_info = ttk.Label(info_section, textvariable=self.settings_info_var, 
                                  style='Info.TLabel')
         settings_info.pack(anchor=tk.W)
         
@@ -790,16 +1303,13 @@ These settings apply globally to all tabs and operations.
         progress_frame.pack(fill=tk.X, pady=(0, 10))
         
         # Progress bar
-        self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=100)
         self.progress_bar.pack(fill=tk.X, pady=(0, 10))
         
         # Progress counter
-        self.progress_counter_var = tk.StringVar(value="Ready to process")
         ttk.Label(progress_frame, textvariable=self.progress_counter_var, style='Title.TLabel').pack(pady=(0, 5))
         
         # Progress label
-        self.progress_label_var = tk.StringVar(value="Ready")
         ttk.Label(progress_frame, textvariable=self.progress_label_var, style='Info.TLabel').pack()
         
         # Info message about file saving
@@ -819,10 +1329,8 @@ These settings apply globally to all tabs and operations.
         frame.columnconfigure(0, weight=1)
         frame.rowconfigure(0, weight=1)
     
-    def create_text_enhancement_tab(self):
+    def create_text_enhancement_tab(self, frame):
         """Create text enhancement tab"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="✨ Text Enhancement")
         
         # Configure frame to expand
         frame.grid_rowconfigure(0, weight=1)
@@ -841,13 +1349,11 @@ These settings apply globally to all tabs and operations.
         type_section.pack(fill=tk.X, pady=(0, 10))
         
         ttk.Label(type_section, text="🔧 Enhancement Type:", style='Subtitle.TLabel').pack(side=tk.LEFT, padx=(0, 15))
-        self.enhancement_type_var = tk.StringVar(value="qwen")
         enhancement_combo = ttk.Combobox(type_section, textvariable=self.enhancement_type_var,
                                        values=["qwen", "wan"], state="readonly", width=20, style='Modern.TCombobox')
         enhancement_combo.pack(side=tk.LEFT, padx=(0, 15))
         
         # Type description
-        self.type_description_var = tk.StringVar(value="Qwen: General text enhancement for images")
         type_desc_label = ttk.Label(type_section, textvariable=self.type_description_var, style='Info.TLabel')
         type_desc_label.pack(side=tk.LEFT, padx=(15, 0))
         
@@ -867,13 +1373,12 @@ These settings apply globally to all tabs and operations.
         model_info = ttk.Frame(settings_section)
         model_info.pack(fill=tk.X, pady=(0, 5))
         ttk.Label(model_info, text="🤖 Selected Model:", style='Subtitle.TLabel').pack(side=tk.LEFT)
-        self.text_model_var = tk.StringVar(value="None selected")
         ttk.Label(model_info, textvariable=self.text_model_var, style='Info.TLabel').pack(side=tk.LEFT, padx=(10, 0))
         
         # Global settings info
         ttk.Label(settings_section, text="⚙️ Model parameters are managed globally in the 'Model Settings' tab.", 
                  style='Info.TLabel').pack(anchor=tk.W, pady=(0, 5))
-        settings_info = ttk.Label(settings_section, text=f"Current: Temp={self.temperature_var.get():.1f}, Max Tokens={self.max_tokens_var.get()}", 
+        settings_info = ttk.Label(settings_section, textvariable=self.settings_info_var, 
                                  style='Info.TLabel')
         settings_info.pack(anchor=tk.W)
         
@@ -907,83 +1412,118 @@ These settings apply globally to all tabs and operations.
     
     def connect_backend(self):
         """Connect to the selected backend"""
-        try:
+        backend = self.backend_var.get()
+        ollama_url = self.ollama_url_var.get()
+        api_key = self.api_key_var.get()
+        
+        if backend == "textgen" and not ollama_url:
+            # For TextGen, validate URL first
+            messagebox.showerror("Error", "TextGen URL is required")
+            return
+        if backend in API_KEY_BACKENDS and not api_key:
+            # For OpenAI/OpenRouter, validate API key first
+            messagebox.showerror("Error", "API key is required for external APIs")
+            return
+        
+        if self.api:
+            # Keep the existing client so its connection pools stay warm
+            self.api.base_url = self.swarmui_url_var.get()
+        else:
             self.api = OllamaVisionAPI(self.swarmui_url_var.get())
-            
+        
+        # Network calls run in the worker pool so the UI stays responsive
+        self._load_gen += 1
+        self.connect_button.config(state=tk.DISABLED)
+        self._spin_connect_button()
+        self.run_in_background(self._connect_worker, backend, ollama_url, api_key,
+                               callback=functools.partial(self._on_connected, self._load_gen),
+                               error_prefix="Connection failed")
+    
+    def _spin_connect_button(self, frame=0):
+        """Animate the connect button while a connection is in progress"""
+        self.connect_button.config(text=f"{'◐◓◑◒'[frame % 4]} Connecting...")
+        self._spinner_after_id = self.root.after(150, self._spin_connect_button, frame + 1)
+    
+    def _connect_worker(self, backend, ollama_url, api_key):
+        """Get a SwarmUI session, connect the backend and fetch its models"""
+        try:
             # Get session ID from SwarmUI first
             session_result = self.api.get_swarmui_session()
             if not session_result["success"]:
-                messagebox.showerror("Error", f"Failed to get SwarmUI session: {session_result['message']}")
-                return
+                return {"success": False, "error": f"Failed to get SwarmUI session: {session_result['message']}"}
             
-            self.update_session_id_display()
-            
-            if self.backend_var.get() == "ollama":
-                result = self.api.connect_ollama(
-                    ollama_url=self.ollama_url_var.get(),
-                    show_all=True
-                )
-            elif self.backend_var.get() == "textgen":
-                # For TextGen, validate URL first
-                textgen_url = self.ollama_url_var.get()
-                if not textgen_url:
-                    messagebox.showerror("Error", "TextGen URL is required")
-                    return
-                result = self.api.connect_textgen(textgen_url)
-            elif self.backend_var.get() in ["openai", "openrouter"]:
-                # For OpenAI/OpenRouter, validate API key first
-                api_key = self.api_key_var.get()
-                if not api_key:
-                    messagebox.showerror("Error", "API key is required for external APIs")
-                    return
+            if backend == "ollama":
+                result = self.api.connect_ollama(ollama_url=ollama_url, show_all=True)
+            elif backend == "textgen":
+                result = self.api.connect_textgen(ollama_url)
+            elif backend in API_KEY_BACKENDS:
                 result = {"success": True, "message": "Connected to external API"}
             else:
                 result = {"success": False, "message": "Unknown backend type"}
             
-            if result.get("success", False):
-                self.load_models()
-                
-                # Update default model display
-                self.update_default_model_display()
-                
-                # Try to select default model if available
-                if self.available_models:
-                    current_default = self.default_model_var.get().strip()
-                    if current_default and current_default in self.available_models:
-                        # Default model is available, select it
-                        self.selected_model = current_default
-                        self.update_model_status_display()
-                        # Connected successfully - status shown in UI
-                    else:
-                        # No default or default not available, select first model
-                        first_model = self.available_models[0]
-                        self.selected_model = first_model
-                        self.update_model_status_display()
-                        # Connected successfully - status shown in UI
-                else:
-                    # Connected successfully - status shown in UI
-                    pass
-                
-                # Update connection state and button
-                self.is_connected = True
-                self.update_connection_button()
-            else:
-                messagebox.showerror("Error", f"Connection failed: {result.get('message', 'Unknown error')}")
-                
+            if not result.get("success", False):
+                return {"success": False, "error": f"Connection failed: {result.get('message', 'Unknown error')}"}
+            
+            return self._load_models_worker(backend, api_key, result)
         except Exception as e:
-            messagebox.showerror("Error", f"Connection failed: {str(e)}")
+            return {"success": False, "error": f"Connection failed: {str(e)}"}
     
-    def disconnect_backend(self):
+    def _on_connected(self, load_gen, outcome):
+        """Apply the result of a background connection attempt"""
+        if load_gen != self._load_gen:
+            # Superseded by a later connect or disconnect
+            return
+        
+        if not outcome["success"]:
+            self.update_connection_button()
+            messagebox.showerror("Error", outcome["error"])
+            return
+        
+        self.update_session_id_display()
+        
+        if outcome.get("models_error"):
+            messagebox.showerror("Error", outcome["models_error"])
+        self.all_models = outcome["models"]
+        self._models_lower = [model.lower() for model in self.all_models]
+        self.filtered_models = self.all_models  # Lists are replaced, never mutated, so sharing is safe
+        self._filtered_lower = self._models_lower
+        self._last_search = ""
+        self.update_models_display()
+        
+        # Update default model display
+        self.update_default_model_display()
+        
+        # Try to select default model if available
+        if self.filtered_models:
+            current_default = self.default_model_var.get().strip()
+            if current_default and current_default in self.filtered_models:
+                # Default model is available, select it
+                self.selected_model = current_default
+            else:
+                # No default or default not available, select first model
+                self.selected_model = self.filtered_models[0]
+            self.update_model_status_display()
+        
+        # Update connection state and button
+        self.is_connected = True
+        self.update_connection_button()
+    
+    def disconnect_backend(self):
         """Disconnect from the current backend"""
         try:
             # Clear connection state
             self.is_connected = False
+            self._load_gen += 1
             self.selected_model = None
-            self.available_models = []
             self.all_models = []
+            self._models_lower = []
             self.filtered_models = []
+            self._filtered_lower = []
+            self._last_search = ""
             
             # Clear API client
+            if self.api:
+                self.api.close()
             self.api = None
             
             # Update UI
@@ -993,14 +1533,18 @@ These settings apply globally to all tabs and operations.
             self.update_default_model_display()
             
         except Exception as e:
-            print(f"Error during disconnect: {str(e)}")
+            logger.warning("Error during disconnect: %s", e)
     
     def update_connection_button(self):
         """Update the connect/disconnect button appearance"""
+        if self._spinner_after_id:
+            self.root.after_cancel(self._spinner_after_id)
+            self._spinner_after_id = None
+        
         if self.is_connected:
-            self.connect_button.config(text="🔴 Disconnect", style="Accent.TButton")
+            self.connect_button.config(text="🔴 Disconnect", style="Accent.TButton", state=tk.NORMAL)
         else:
-            self.connect_button.config(text="Connect", style="TButton")
+            self.connect_button.config(text="Connect", style="TButton", state=tk.NORMAL)
     
     def reset_session(self):
         """Reset the session ID (internal function, no UI)"""
@@ -1010,16 +1554,15 @@ These settings apply globally to all tabs and operations.
                 self.update_session_id_display()
                 # Session reset silently - no popup
             except Exception as e:
-                print(f"Failed to reset session: {str(e)}")
+                logger.warning("Failed to reset session: %s", e)
         else:
-            print("No connection available for session reset")
+            logger.warning("No connection available for session reset")
     
     def update_session_id_display(self):
         """Update the session ID display"""
-        if hasattr(self, 'api'):
-            self.session_id_var.set(self.api.get_session_id())
-        else:
-            self.session_id_var.set("Not connected")
+        session_id = self.api.get_session_id() if self.api else "Not connected"
+        if self.session_id_var.get() != session_id:
+            self.session_id_var.set(session_id)
     
     def update_connection_fields(self):
         """Update which connection fields are visible based on backend"""
@@ -1035,7 +1578,7 @@ These settings apply globally to all tabs and operations.
             # Show Ollama URL field
             self.ollama_url_label.grid(row=2, column=0, sticky=tk.W, pady=2)
             self.ollama_url_entry.grid(row=2, column=1, padx=5, pady=2)
-        elif backend in ["openai", "openrouter"]:
+        elif backend in API_KEY_BACKENDS:
             # Show API Key field
             self.api_key_label.grid(row=2, column=0, sticky=tk.W, pady=2)
             self.api_key_entry.grid(row=2, column=1, padx=5, pady=2)
@@ -1073,91 +1616,94 @@ These settings apply globally to all tabs and operations.
         
         # Auto-save settings
         self.auto_save_settings()
+        
+        # Warm the model list cache once typing pauses
+        if self._prefetch_after_id:
+            self.root.after_cancel(self._prefetch_after_id)
+        self._prefetch_after_id = self.root.after(500, self._prefetch_models)
+    
+    def _prefetch_models(self):
+        """Fetch the current backend's model list in the background so connecting is instant"""
+        self._prefetch_after_id = None
+        backend = self.backend_var.get()
+        api_key = self.api_key_var.get()
+        if not self.api or not api_key or backend not in API_KEY_BACKENDS:
+            return
+        
+        fetch = self.api.get_openai_models if backend == "openai" else self.api.get_openrouter_models
+        self.executor.submit(fetch, api_key)
     
     def auto_save_settings(self):
+        """Schedule an auto-save once changes pause, so typing doesn't write on every key"""
+        if self._save_after_id:
+            self.root.after_cancel(self._save_after_id)
+        self._save_after_id = self.root.after(500, self._flush_auto_save)
+    
+    def _flush_auto_save(self):
         """Auto-save settings without showing message"""
+        self._save_after_id = None
         try:
-            # Update stored API keys based on current backend
-            current_backend = self.backend_var.get()
-            if current_backend == "openai":
-                self.openai_api_key = self.api_key_var.get()
-            elif current_backend == "openrouter":
-                self.openrouter_api_key = self.api_key_var.get()
-            elif current_backend == "textgen":
-                self.textgen_url = self.ollama_url_var.get()
-            
-            settings = {
-                "swarmui_url": self.swarmui_url_var.get(),
-                "backend": self.backend_var.get(),
-                "ollama_url": self.ollama_url_var.get(),
-                "api_key": self.api_key_var.get(),
-                "default_model": self.default_model_var.get(),
-                "session_id": self.session_id_var.get() if hasattr(self, 'session_id_var') else "",
-                "openai_api_key": self.openai_api_key,
-                "openrouter_api_key": self.openrouter_api_key,
-                "textgen_url": self.textgen_url
-            }
-            
-            with open("ollamavision_settings.json", 'w') as f:
-                json.dump(settings, f, indent=2)
+            self._sync_connection_settings()
+            self._write_settings()
         except Exception as e:
-            print(f"Auto-save failed: {e}")
+            logger.warning("Auto-save failed: %s", e)
     
-    def load_models(self):
-        """Load available models"""
-        self.models_listbox.delete(0, tk.END)
-        self.available_models = []
+    def _sync_connection_settings(self):
+        """Copy the connection fields into the live settings, keeping everything else"""
+        # Update stored API keys based on current backend
+        current_backend = self.backend_var.get()
+        if current_backend == "openai":
+            self.openai_api_key = self.api_key_var.get()
+        elif current_backend == "openrouter":
+            self.openrouter_api_key = self.api_key_var.get()
+        elif current_backend == "textgen":
+            self.textgen_url = self.ollama_url_var.get()
         
+        self._settings.update({
+            "swarmui_url": self.swarmui_url_var.get(),
+            "backend": current_backend,
+            "ollama_url": self.ollama_url_var.get(),
+            "api_key": self.api_key_var.get(),
+            "default_model": self.default_model_var.get(),
+            "session_id": self.session_id_var.get(),
+            # Save API keys for different backends
+            "openai_api_key": self.openai_api_key,
+            "openrouter_api_key": self.openrouter_api_key,
+            "textgen_url": self.textgen_url
+        })
+    
+    def _load_models_worker(self, backend, api_key, connect_result):
+        """Fetch and sort the model list for a backend (runs in the worker pool)"""
+        models = []
+        models_error = None
         try:
-            if self.backend_var.get() == "ollama":
-                result = self.api.connect_ollama(show_all=True)
-                if result.get("success") and "models" in result:
-                    models = result["models"]
-                    # Sort models alphabetically
-                    models.sort()
-                    self.all_models = models.copy()
-                    self.filtered_models = models.copy()
-                    self.update_models_display()
-            elif self.backend_var.get() == "openai":
-                api_key = self.api_key_var.get()
-                if not api_key:
-                    messagebox.showerror("Error", "API key is required for OpenAI")
-                    return
-                
+            if backend == "ollama":
+                if "models" in connect_result:
+                    models = connect_result["models"]
+            elif backend == "openai":
                 result = self.api.get_openai_models(api_key)
                 if result.get("success"):
                     models = result["models"]
-                    # Sort models alphabetically
-                    models.sort()
-                    self.all_models = models.copy()
-                    self.filtered_models = models.copy()
-                    self.update_models_display()
                 else:
-                    messagebox.showerror("Error", f"Failed to fetch OpenAI models: {result.get('message', 'Unknown error')}")
-            elif self.backend_var.get() == "openrouter":
-                api_key = self.api_key_var.get()
-                if not api_key:
-                    messagebox.showerror("Error", "API key is required for OpenRouter")
-                    return
-                
+                    models_error = f"Failed to fetch OpenAI models: {result.get('message', 'Unknown error')}"
+            elif backend == "openrouter":
                 result = self.api.get_openrouter_models(api_key)
                 if result.get("success"):
                     models = result["models"]
-                    # Sort models alphabetically
-                    models.sort()
-                    self.all_models = models.copy()
-                    self.filtered_models = models.copy()
-                    self.update_models_display()
                 else:
-                    messagebox.showerror("Error", f"Failed to fetch OpenRouter models: {result.get('message', 'Unknown error')}")
+                    models_error = f"Failed to fetch OpenRouter models: {result.get('message', 'Unknown error')}"
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load models: {str(e)}")
+            models_error = f"Failed to load models: {str(e)}"
+        
+        # Sort models alphabetically
+        models.sort()
+        return {"success": True, "models": models, "models_error": models_error}
     
     def on_model_select(self, event):
         """Handle model selection"""
         selection = self.models_listbox.curselection()
         if selection:
-            model = self.available_models[selection[0]]
+            model = self.filtered_models[selection[0]]
             self.selected_model = model  # Store selected model globally
             
             # Update model status in all tabs
@@ -1184,10 +1730,31 @@ These settings apply globally to all tabs and operations.
     def update_default_model_display(self):
         """Update the default model display"""
         default_model = self.default_model_var.get().strip()
-        if default_model:
-            self.default_model_display_var.set(f"Default: {default_model}")
-        else:
-            self.default_model_display_var.set("No default model set")
+        text = f"Default: {default_model}" if default_model else "No default model set"
+        if self.default_model_display_var.get() != text:
+            self.default_model_display_var.set(text)
+    
+    def _invalidate_model_params(self, *args):
+        """Drop the cached model parameters after a settings edit"""
+        self._model_params = None
+    
+    def _refresh_settings_info(self, *args):
+        """Re-format the settings summary after temperature or max tokens change"""
+        try:
+            self.settings_info_var.set(f"Current: Temp={self.temperature_var.get():.1f}, "
+                                       f"Max Tokens={self.max_tokens_var.get()}")
+        except tk.TclError:
+            # A spinbox is mid-edit and doesn't hold a number yet; keep the last summary
+            pass
+    
+    def get_model_params(self):
+        """Get the request model parameters, re-reading the Tk variables only after an edit"""
+        if self._model_params is None:
+            self._model_params = {
+                "temperature": self.temperature_var.get(),
+                "max_tokens": self.max_tokens_var.get()
+            }
+        return self._model_params
     
     def get_selected_model(self):
         """Get the currently selected model"""
@@ -1196,8 +1763,8 @@ These settings apply globally to all tabs and operations.
         
         # Fallback: try to get from listbox selection
         selection = self.models_listbox.curselection()
-        if selection and selection[0] < len(self.available_models):
-            return self.available_models[selection[0]]
+        if selection and selection[0] < len(self.filtered_models):
+            return self.filtered_models[selection[0]]
         
         return None
     
@@ -1215,28 +1782,49 @@ These settings apply globally to all tabs and operations.
         else:
             model_name = "None selected"
         
-        # Update all tab model status indicators
-        if hasattr(self, 'single_image_model_var'):
-            self.single_image_model_var.set(model_name)
-        if hasattr(self, 'batch_model_var'):
-            self.batch_model_var.set(model_name)
-        if hasattr(self, 'text_model_var'):
-            self.text_model_var.set(model_name)
+        # Setting a variable redraws every label bound to it, so skip unchanged text
+        if model_name == self._last_model_status:
+            return
+        self._last_model_status = model_name
         
-        # Update connection tab model info
-        if hasattr(self, 'model_info_var'):
-            self.model_info_var.set(model_name)
+        # Update all tab model status indicators and the connection tab model info
+        for var in self._model_status_vars:
+            var.set(model_name)
     
     def filter_models(self, *args):
+        """Schedule model filtering once typing pauses"""
+        if self._filter_after_id:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(120, self._do_filter_models)
+    
+    def _do_filter_models(self):
         """Filter models based on search text"""
+        self._filter_after_id = None
         search_text = self.model_search_var.get().lower()
         
         if not search_text:
             # Show all models if no search text
-            self.filtered_models = self.all_models.copy()
+            filtered_models = self.all_models
+            filtered_lower = self._models_lower
         else:
+            # When the search only got longer, only the previous matches can still match
+            if self._last_search and search_text.startswith(self._last_search):
+                models, models_lower = self.filtered_models, self._filtered_lower
+            else:
+                models, models_lower = self.all_models, self._models_lower
+            
             # Filter models that contain search text
-            self.filtered_models = [model for model in self.all_models if search_text in model.lower()]
+            matches = [i for i, model_lower in enumerate(models_lower) if search_text in model_lower]
+            filtered_models = [models[i] for i in matches]
+            filtered_lower = [models_lower[i] for i in matches]
+        
+        self._last_search = search_text
+        self._filtered_lower = filtered_lower
+        
+        # Skip rebuilding the listbox (and losing the selection) when the matches haven't changed
+        if filtered_models == self.filtered_models:
+            return
+        self.filtered_models = filtered_models
         
         # Update the listbox
         self.update_models_display()
@@ -1247,18 +1835,12 @@ These settings apply globally to all tabs and operations.
     
     def update_models_display(self):
         """Update the models listbox display"""
-        # Clear current selection
-        self.models_listbox.selection_clear(0, tk.END)
-        
-        # Clear the listbox
+        # Clear the listbox (also drops the current selection)
         self.models_listbox.delete(0, tk.END)
         
-        # Add filtered models to listbox
-        for model in self.filtered_models:
-            self.models_listbox.insert(tk.END, model)
-        
-        # Update available_models to match filtered list
-        self.available_models = self.filtered_models.copy()
+        # Add filtered models to listbox in a single Tcl call
+        if self.filtered_models:
+            self.models_listbox.insert(tk.END, *self.filtered_models)
         
         # Update model count display
         total_models = len(self.all_models)
@@ -1278,52 +1860,188 @@ These settings apply globally to all tabs and operations.
             filetypes=[("Image files", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff")]
         )
         if file_path:
-            print(f"Image selected: {file_path}")  # Debug print
+            logger.debug("Image selected: %s", file_path)
             self.image_path_var.set(file_path)
             self.load_image_preview(file_path)
     
     def load_image_preview(self, file_path):
         """Load and display image preview"""
+        # Drop any preview still queued for a previously selected image
+        if self._preview_future:
+            self._preview_future.cancel()
+        self.current_image_data = None
+        
+        # Decode and encode in the preview pool, then draw on the Tk thread
+        future = self._preview_pool.submit(self._decode_preview, file_path)
+        self._preview_future = future
+        future.add_done_callback(
+            lambda f: self._ui_call(self._on_preview_loaded, f, file_path))
+    
+    def _decode_preview(self, file_path, size=PREVIEW_SIZE):
+        """Decode a downscaled preview and the API data for an image (runs in the preview pool)"""
+        # Key on mtime so edited files get a fresh thumbnail
+        preview = self._load_thumbnail(file_path, os.stat(file_path).st_mtime_ns, size)
+        # The canvas photos are RGBA; convert other modes here rather than on the Tk thread
+        if preview.mode not in ("RGB", "RGBA"):
+            preview = preview.convert("RGBA")
+        
+        # Convert to base64 for API
+        return preview, self._read_image_data(file_path)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _load_thumbnail(file_path, mtime_ns, size):
+        """Load a preview thumbnail from the disk cache, decoding and caching it on a miss"""
+        key = f"{os.path.abspath(file_path)}|{mtime_ns}|{size[0]}x{size[1]}"
+        cache_path = THUMBNAIL_CACHE_DIR / (hashlib.sha1(key.encode()).hexdigest() + ".webp")
         try:
-            # Load image
-            image = Image.open(file_path)
-            
-            # Resize for preview to fit canvas (400x300)
-            image.thumbnail((380, 280), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(image)
-            
-            # Clear canvas and display image
-            self.image_canvas.delete("all")
-            self.image_canvas.create_image(200, 150, image=photo, anchor=tk.CENTER)
-            self.image_canvas.image = photo  # Keep a reference
-            
-            print(f"Image loaded successfully: {file_path}")  # Debug print
-            
-            # Convert to base64 for API
-            with open(file_path, "rb") as f:
-                image_data = f.read()
-            
-            # Get file extension
-            ext = Path(file_path).suffix.lower()
-            if ext in ['.jpg', '.jpeg']:
-                mime_type = "image/jpeg"
-            elif ext == '.png':
-                mime_type = "image/png"
-            elif ext == '.gif':
-                mime_type = "image/gif"
-            else:
-                mime_type = "image/jpeg"
-            
-            self.current_image_data = f"data:{mime_type};base64,{base64.b64encode(image_data).decode()}"
-            
+            with Image.open(cache_path) as cached:
+                preview = cached.copy()
+            # Mark it as recently used so pruning keeps it
+            os.utime(cache_path)
+            return preview
+        except (OSError, ValueError):
+            pass
+        
+        with Image.open(file_path) as image:
+            # Let the JPEG decoder scale down during decoding (no-op for other formats)
+            image.draft('RGB', size)
+            # BILINEAR looks the same as LANCZOS at preview size; only the model input needs LANCZOS.
+            # thumbnail() already reduces by whole factors first (its default reducing_gap=2.0)
+            image.thumbnail(size, Image.Resampling.BILINEAR)
+            preview = image.copy()
+        
+        # The disk cache is best effort; write to a temp file so readers never see a partial one
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{threading.get_ident()}.tmp")
+        try:
+            THUMBNAIL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            preview.save(tmp_path, format="WEBP", quality=85)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            # Includes KeyError from Pillow builds without WebP support
+            logger.debug("Could not cache thumbnail for %s: %s", file_path, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        else:
+            if next(_thumbnail_writes) % THUMBNAIL_PRUNE_INTERVAL == 0:
+                OllamaVisionGUI._prune_thumbnail_cache()
+        return preview
+    
+    @staticmethod
+    def _prune_thumbnail_cache(max_files=THUMBNAIL_CACHE_MAX_FILES):
+        """Delete the least recently used cached thumbnails beyond max_files"""
+        try:
+            with os.scandir(THUMBNAIL_CACHE_DIR) as entries:
+                files = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.is_file()]
+        except OSError:
+            return
+        if len(files) <= max_files:
+            return
+        
+        files.sort()
+        for _, path in files[:len(files) - max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _on_preview_loaded(self, future, file_path):
+        """Show a decoded preview, unless a newer image has been selected since"""
+        if future is not self._preview_future or future.cancelled():
+            return
+        self._preview_future = None
+        
+        try:
+            preview, image_data = future.result()
         except Exception as e:
-            # Clear canvas and show placeholder text
-            self.image_canvas.delete("all")
-            self.image_canvas.create_text(200, 150, text="Failed to load image", 
-                                        font=("Arial", 12), fill="red", anchor=tk.CENTER)
+            # Clear the image and show placeholder text
+            self.image_canvas.itemconfigure(self._canvas_image_id, image="")
+            self.image_canvas.itemconfigure(self._canvas_text_id, text="Failed to load image",
+                                            fill="red", state=tk.NORMAL)
+            self._front_photo = self._back_photo = None
             messagebox.showerror("Error", f"Failed to load image: {str(e)}")
+            return
+        
+        # Draw into the off-screen PhotoImage (must be on the Tk thread), reusing it when the
+        # size still matches; previews of a folder of same-shaped images mostly do
+        from PIL import ImageTk  # Deferred, only needed once an image is shown
+        if self._back_photo is None or (self._back_photo.width(), self._back_photo.height()) != preview.size:
+            self._back_photo = ImageTk.PhotoImage("RGBA", preview.size)
+        self._back_photo.paste(preview)
+        
+        # Swap it into the existing canvas item and hide the placeholder
+        self.image_canvas.itemconfigure(self._canvas_image_id, image=self._back_photo)
+        self.image_canvas.itemconfigure(self._canvas_text_id, state=tk.HIDDEN)
+        self._front_photo, self._back_photo = self._back_photo, self._front_photo
+        
+        logger.debug("Image loaded successfully: %s", file_path)
+        
+        self.current_image_data = image_data
+    
+    def _read_image_data(self, file_path, use_cache=True):
+        """Read an image file as a base64 data URI for the API, reusing recent results"""
+        if not use_cache:
+            return self._build_data_uri(file_path)
+        
+        # Key on mtime and size so edited files are re-encoded
+        st = os.stat(file_path)
+        key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        with self._data_uri_lock:
+            data_uri = self._data_uri_cache.get(key)
+            if data_uri is not None:
+                self._data_uri_cache.move_to_end(key)
+                return data_uri
+        
+        data_uri = self._build_data_uri(file_path, st.st_size)
+        
+        with self._data_uri_lock:
+            self._data_uri_cache[key] = data_uri
+            if len(self._data_uri_cache) > self.DATA_URI_CACHE_SIZE:
+                self._data_uri_cache.popitem(last=False)
+        return data_uri
+    
+    def _build_data_uri(self, file_path, size=None):
+        """Encode an image file as a base64 data URI"""
+        # Get file extension
+        ext = Path(file_path).suffix.lower()
+        if ext in TRANSCODE_EXTENSIONS:
+            # Vision backends don't accept these formats, send them as JPEG
+            with Image.open(file_path) as image:
+                return f"data:image/jpeg;base64,{self._encode_pil_b64(image)}"
+        
+        mime_type = IMAGE_MIME_TYPES.get(ext, "image/jpeg")
+        return OllamaVisionAPI._encode_file_b64(file_path, size, prefix=f"data:{mime_type};base64,")
+    
+    def _read_batch_image_data(self, file_path, max_dim=BATCH_MAX_DIMENSION):
+        """Read an image for batch captioning, downscaling very large ones to a JPEG first"""
+        with Image.open(file_path) as image:
+            # Only the header has been read so far; small images are sent untouched
+            # (and not cached, since each batch image is only sent once)
+            if max(image.size) <= max_dim:
+                return self._read_image_data(file_path, use_cache=False)
+            
+            # Let the JPEG decoder scale down during decoding; the model sees this, so keep LANCZOS
+            image.draft('RGB', (max_dim, max_dim))
+            image.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+            return f"data:image/jpeg;base64,{self._encode_pil_b64(image)}"
+    
+    def _encode_pil_b64(self, image):
+        """JPEG-encode a PIL image into a per-thread reusable buffer and base64 it"""
+        buffer = getattr(self._encode_buffers, "buffer", None)
+        if buffer is None:
+            buffer = self._encode_buffers.buffer = io.BytesIO()
+        buffer.seek(0)
+        buffer.truncate(0)
+        # JPEG can store RGB and grayscale as-is; only other modes need a converted copy
+        if image.mode not in ("RGB", "L"):
+            with image.convert("RGB") as converted:
+                converted.save(buffer, format="JPEG", quality=90, optimize=False)
+        else:
+            image.save(buffer, format="JPEG", quality=90, optimize=False)
+        with buffer.getbuffer() as view:
+            return _b64encode_str(view)
     
     def analyze_single_image(self):
         """Analyze a single image"""
@@ -1331,7 +2049,7 @@ These settings apply globally to all tabs and operations.
             messagebox.showerror("Error", "Please select an image first")
             return
         
-        if not self.available_models:
+        if not self.filtered_models:
             messagebox.showerror("Error", "Please connect to a backend first")
             return
         
@@ -1341,73 +2059,63 @@ These settings apply globally to all tabs and operations.
             messagebox.showerror("Error", "Please select a model from the Connection tab")
             return
         
+        try:
+            params = self.get_model_params()
+        except tk.TclError:
+            messagebox.showerror("Error", "Invalid model parameters, please check the Model Settings tab")
+            return
+        
+        # The backend only returns the finished response, so clear out the previous one meanwhile
+        self.image_analysis_text.delete("1.0", tk.END)
+        self.image_analysis_text.insert("1.0", "Waiting for the model's response...")
+        
         # Run analysis in thread
-        thread = threading.Thread(target=self._analyze_image_thread, args=(model,))
-        thread.daemon = True
-        thread.start()
+        self.executor.submit(self._analyze_image_thread, model, params)
     
-    def _analyze_image_thread(self, model):
+    def _analyze_image_thread(self, model, params):
         """Analyze image in separate thread"""
         try:
-            self.root.after(0, lambda: self.progress_label_var.set("Analyzing image..."))
+            self._ui_progress("Analyzing image...")
             
-            # Wan I2V system prompt
-            wan_i2v_system_prompt = None
-            if self.wan_i2v_var.get():
-                wan_i2v_system_prompt = ("You are a movie director. You can take a single image and turn it into a full thought out scene. "
-                                       "Instead of screenplays you write video generation prompts for image to video. You don't need to describe the image. "
-                                       "Just analyze the image and describe a scene with motion and camera movements based on the image given to you. "
-                                       "The user may give a short prompt for direction. Enhance that prompt and flesh out the users idea. Don't be vague. "
-                                       "Describe action and movement don't' just say \"moves, runs, walks\" give action words to the action itself. "
-                                       "Do not describe sounds as the video will not have sound. Mention things in the image but there is no need to describe them. "
-                                       "If you want a man in a green shirt that is in the image to move simply say something like this example shows: "
-                                       "\"the man in the green shirt begins to walk briskly...\". Begin your prompt with what the image shows. "
-                                       "The image sent to you will be the first frame of the video so you should make your prompt with this in mind. "
-                                       "Do not begin the scene with anything other than the image sent to you. Take the first frame image and expand from that. "
-                                       "The video will be on average about 5 seconds in length. Make your prompt fit within this constraint. "
-                                       "Do not make the prompt so long that it can't fit into a 5 second video clip. Be descriptive but concise. "
-                                       "Don't use phrasing like \"the camera pivots behind a hovering helicopter\" instead say \"the camera pivots behind the hovering helicopter\" "
-                                       "use what's in the image to build the prompt.\n\n"
-                                       "Return only the prompt you make from the image. Do not explain yourself or give any extra information other than the prompt you make from the image. "
-                                       "Do not describe the image or give any information about the image other than the video prompt. The prompt should not include any description of the image.")
+            wan_i2v_system_prompt = WAN_I2V_SYSTEM_PROMPT if self.wan_i2v_var.get() else None
+            backend = self.backend_var.get()
+            api_key = self.api_key_var.get() if backend in API_KEY_BACKENDS else None
             
             result = self.api.analyze_image(
                 image_data=self.current_image_data,
                 model=model,
-                backend_type=self.backend_var.get(),
+                backend_type=backend,
                 prompt=self.prompt_var.get(),
-                temperature=self.temperature_var.get(),
-                max_tokens=self.max_tokens_var.get(),
+                **params,
                 ollama_url=self.ollama_url_var.get(),
-                api_key=self.api_key_var.get() if self.backend_var.get() in ["openai", "openrouter"] else None,
+                api_key=api_key,
                 system_prompt=wan_i2v_system_prompt
             )
             
             # Display result in the same tab
-            self.root.after(0, lambda: self.display_image_analysis_result(result))
+            self._ui_call(self.display_image_analysis_result, result)
             
         except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Analysis failed: {error_msg}"))
+            # Replace the waiting placeholder as well as reporting the error
+            self._ui_call(self.display_image_analysis_result, APIResult(success=False, message=str(e)))
+            self._ui_call(messagebox.showerror, "Error", f"Analysis failed: {str(e)}")
         finally:
-            self.root.after(0, lambda: self.progress_label_var.set("Ready"))
+            self._ui_progress("Ready")
     
     def display_image_analysis_result(self, result):
         """Display image analysis result in the single image tab"""
         # Clear previous results
         self.image_analysis_text.delete("1.0", tk.END)
         
-        if isinstance(result, dict) and result.get("success"):
+        if result.success:
             # Show only the LLM response
-            response = result.get("response", "")
-            if response:
-                self.image_analysis_text.insert("1.0", response)
+            if result.response:
+                self.image_analysis_text.insert("1.0", result.response)
             else:
                 self.image_analysis_text.insert("1.0", "No analysis response received.")
         else:
             # Show error message
-            error_msg = result.get('message', 'Unknown error occurred') if isinstance(result, dict) else str(result)
-            self.image_analysis_text.insert("1.0", f"Error: {error_msg}")
+            self.image_analysis_text.insert("1.0", f"Error: {result.message or 'Unknown error occurred'}")
         
         self.image_analysis_text.see(tk.END)
     
@@ -1423,7 +2131,7 @@ These settings apply globally to all tabs and operations.
             messagebox.showerror("Error", "Please select a folder first")
             return
         
-        if not self.available_models:
+        if not self.filtered_models:
             messagebox.showerror("Error", "Please connect to a backend first")
             return
         
@@ -1433,81 +2141,218 @@ These settings apply globally to all tabs and operations.
             messagebox.showerror("Error", "Please select a model from the Connection tab")
             return
         
+        try:
+            params = self.get_model_params()
+        except tk.TclError:
+            messagebox.showerror("Error", "Invalid model parameters, please check the Model Settings tab")
+            return
+        
+        try:
+            # More parallel requests than SwarmUI connections would only queue
+            concurrency = min(max(1, self.batch_concurrency_var.get()), OllamaVisionAPI.SWARMUI_POOL_SIZE)
+        except tk.TclError:
+            messagebox.showerror("Error", "Parallel requests must be a whole number")
+            return
+        
         # Reset progress display
         self.progress_var.set(0)
         self.progress_counter_var.set("Preparing batch processing...")
         self.progress_label_var.set("Ready")
         
         # Run batch processing in thread
-        thread = threading.Thread(target=self._process_batch_thread, args=(model,))
-        thread.daemon = True
-        thread.start()
+        self._batch_future = self.executor.submit(self._process_batch_thread, model, params, concurrency)
+        if not self._progress_after_id:
+            self._progress_after_id = self.root.after(self.PROGRESS_INTERVAL_MS, self._drain_progress_queue)
     
-    def _process_batch_thread(self, model):
+    def _process_batch_thread(self, model, params, concurrency):
         """Process batch in separate thread"""
         try:
             folder_path = self.folder_path_var.get()
             
             # Count images first
-            self.root.after(0, lambda: self.progress_label_var.set("Scanning folder for images..."))
-            self.root.after(0, lambda: self.progress_var.set(0))
+            self._queue_progress("Scanning folder for images...", progress=0)
             
-            # Get list of image files
-            image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
-            image_files = []
-            
-            for file in os.listdir(folder_path):
-                if any(file.lower().endswith(ext) for ext in image_extensions):
-                    image_files.append(file)
+            # Get list of image files (one set lookup per directory entry)
+            with os.scandir(folder_path) as entries:
+                image_files = [entry.path for entry in entries
+                               if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+                               and entry.is_file()]
+            image_files.sort()
             
             total_images = len(image_files)
             
             if total_images == 0:
-                self.root.after(0, lambda: self.progress_counter_var.set("No images found in folder"))
-                self.root.after(0, lambda: self.progress_label_var.set("No image files found in the selected folder."))
+                self._queue_progress("No image files found in the selected folder.",
+                                     counter_text="No images found in folder")
                 return
             
             # Update progress display
-            self.root.after(0, lambda: self.progress_counter_var.set(f"Found {total_images} images to process"))
-            self.root.after(0, lambda: self.progress_label_var.set("Starting batch processing..."))
+            self._queue_progress("Starting batch processing...",
+                                 counter_text=f"Found {total_images} images to process")
             
-            # Process images
-            result = self.api.batch_caption_images(
-                folder_path=folder_path,
+            # Process images, one request per image
+            backend = self.backend_var.get()
+            api_key = self.api_key_var.get() if backend in API_KEY_BACKENDS else None
+            result = self.batch_caption_parallel(
+                image_files,
                 model=model,
-                backend_type=self.backend_var.get(),
+                backend_type=backend,
                 caption_style=self.caption_style_var.get(),
                 trigger_word=self.trigger_word_var.get(),
-                temperature=self.temperature_var.get(),
-                max_tokens=self.max_tokens_var.get(),
+                **params,
                 ollama_url=self.ollama_url_var.get(),
-                api_key=self.api_key_var.get() if self.backend_var.get() in ["openai", "openrouter"] else None
+                api_key=api_key,
+                max_workers=concurrency
             )
             
-            # Update progress to complete
-            self.root.after(0, lambda: self.progress_var.set(100))
-            
-            # Get actual processed count from result
-            actual_processed = result.get('processed', total_images)
-            actual_successful = result.get('successful', 0)
-            actual_failed = result.get('failed', 0)
+            # The final state, queued behind the per-image updates so it is always applied last
+            self._queue_progress("Batch processing complete!" if result.success else "Batch processing failed",
+                                 progress=100,
+                                 counter_text=f"Completed: {result.processed}/{total_images} images "
+                                              f"(✓{result.successful} ✗{result.failed})")
             
-            self.root.after(0, lambda: self.progress_counter_var.set(f"Completed: {actual_processed}/{total_images} images (✓{actual_successful} ✗{actual_failed})"))
-            self.root.after(0, lambda: self.progress_label_var.set("Batch processing complete!"))
-            
-            # Display result
-            self.root.after(0, lambda: self.display_batch_result(result))
+            # Only failures are shown (every image failed), so don't hand the Tk thread a no-op callback
+            if not result.success:
+                self._ui_call(self.display_batch_result, result)
             
         except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Batch processing failed: {error_msg}"))
+            self._queue_progress("Ready")
+            self._ui_call(messagebox.showerror, "Error", f"Batch processing failed: {str(e)}")
+    
+    def batch_caption_parallel(self, image_files, model, backend_type="ollama",
+                               caption_style="Danbooru Tags", trigger_word="",
+                               temperature=0.8, max_tokens=500, ollama_url="http://localhost:11434",
+                               api_key=None, max_workers=4):
+        """Caption images concurrently, writing a .txt caption file next to each one"""
+        prompt = CAPTION_STYLE_PROMPTS.get(caption_style, CAPTION_STYLE_PROMPTS["Simple Description"])
+        options = {
+            "backend_type": backend_type,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "ollama_url": ollama_url,
+            "api_key": api_key
+        }
+        
+        total_images = len(image_files)
+        successful = 0
+        failed = 0
+        last_error = None
+        
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ova-batch")
+        futures = {pool.submit(self._caption_one, path, model, prompt, trigger_word, options): path
+                   for path in image_files}
+        # Lets on_close cancel the images that haven't started yet
+        self._batch_image_futures = futures
+        
+        try:
+            # Stream progress to the UI as each image finishes
+            for done, future in enumerate(as_completed(futures), 1):
+                if self._stop_event.is_set():
+                    return APIResult(success=False, message="Batch processing was stopped",
+                                     processed=done - 1, successful=successful, failed=failed)
+                
+                file_name = os.path.basename(futures[future])
+                try:
+                    future.result()
+                    successful += 1
+                    label = f"Captioned {file_name}"
+                except Exception as e:
+                    failed += 1
+                    last_error = str(e)
+                    label = f"Failed {file_name}: {last_error}"
+                
+                self._progress_queue.put((done * 100 / total_images,
+                                          f"Processing: {done}/{total_images} images (✓{successful} ✗{failed})", label))
         finally:
-            self.root.after(0, lambda: self.progress_label_var.set("Ready"))
-    
+            # Drop whatever is still queued (only left over when stopping) without waiting on it
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+            self._batch_image_futures = ()
+        
+        # Every image failing usually means the backend is unreachable or misconfigured
+        message = f"All {failed} images failed. Last error: {last_error}" if not successful else ""
+        return APIResult(success=successful > 0, message=message,
+                         processed=total_images, successful=successful, failed=failed)
+    
+    def _caption_one(self, image_path, model, prompt, trigger_word, options):
+        """Caption one batch image, retrying failures before giving up on it"""
+        for attempt in range(self.BATCH_ATTEMPTS):
+            if self._stop_event.is_set():
+                raise Exception("Batch processing was stopped")
+            try:
+                return self._caption_image(image_path, model, prompt, trigger_word, options)
+            except Exception as e:
+                if attempt == self.BATCH_ATTEMPTS - 1:
+                    raise
+                logger.debug("Retrying %s after error: %s", image_path, e)
+    
+    def _caption_image(self, image_path, model, prompt, trigger_word, options):
+        """Caption a single image and save the caption next to it"""
+        result = self.api.analyze_image(
+            image_data=self._read_batch_image_data(image_path),
+            model=model,
+            prompt=prompt,
+            **options
+        )
+        if not result.success:
+            raise Exception(result.message or "Unknown error")
+        
+        caption = result.response.strip()
+        if trigger_word:
+            caption = f"{trigger_word}, {caption}"
+        
+        # The app may have been closed while the request was in flight
+        if self._stop_event.is_set():
+            raise Exception("Batch processing was stopped")
+        
+        with open(os.path.splitext(image_path)[0] + ".txt", 'w', encoding='utf-8') as f:
+            f.write(caption)
+    
+    def _update_progress(self, progress=None, counter_text=None, label_text=None):
+        """Update the progress widgets, leaving any that are None unchanged"""
+        if progress is not None:
+            self.progress_var.set(progress)
+        if counter_text is not None:
+            self.progress_counter_var.set(counter_text)
+        if label_text is not None:
+            self.progress_label_var.set(label_text)
+    
+    def _ui_progress(self, label_text, progress=None, counter_text=None):
+        """Update the progress widgets from a worker thread, as one Tk callback"""
+        self._ui_call(self._update_progress, progress, counter_text, label_text)
+    
+    def _queue_progress(self, label_text, progress=None, counter_text=None):
+        """Queue a batch progress update for the Tk thread's drain loop"""
+        # Batch updates all go through the queue so they are applied in the order they were made
+        self._progress_queue.put((progress, counter_text, label_text))
+    
+    def _drain_progress_queue(self):
+        """Apply the queued batch progress updates, polling until the batch finishes"""
+        # Fold the queued updates in order, so later values win but fields a later update
+        # leaves as None keep the earlier value; the widgets are then set once
+        update = [None, None, None]
+        try:
+            while True:
+                for i, value in enumerate(self._progress_queue.get_nowait()):
+                    if value is not None:
+                        update[i] = value
+        except queue.Empty:
+            pass
+        if update != [None, None, None]:
+            self._update_progress(*update)
+        
+        if self._batch_future and not self._batch_future.done():
+            self._progress_after_id = self.root.after(self.PROGRESS_INTERVAL_MS, self._drain_progress_queue)
+        elif not self._progress_queue.empty():
+            # Updates posted just before the batch finished
+            self._progress_after_id = self.root.after(0, self._drain_progress_queue)
+        else:
+            self._progress_after_id = None
     
     def enhance_text(self):
         """Enhance text"""
-        if not self.available_models:
+        if not self.filtered_models:
             messagebox.showerror("Error", "Please connect to a backend first")
             return
         
@@ -1523,76 +2368,49 @@ These settings apply globally to all tabs and operations.
             messagebox.showerror("Error", "Please enter text to enhance")
             return
         
+        try:
+            params = self.get_model_params()
+        except tk.TclError:
+            messagebox.showerror("Error", "Invalid model parameters, please check the Model Settings tab")
+            return
+        
         # Run enhancement in thread
-        thread = threading.Thread(target=self._enhance_text_thread, args=(model, text))
-        thread.daemon = True
-        thread.start()
+        self.executor.submit(self._enhance_text_thread, model, text, params)
     
-    def _enhance_text_thread(self, model, text):
+    def _enhance_text_thread(self, model, text, params):
         """Enhance text in separate thread"""
         try:
-            self.root.after(0, lambda: self.progress_label_var.set("Enhancing text..."))
+            self._ui_progress("Enhancing text...")
             
             # Get the system prompt for the selected enhancement type
             enhancement_type = self.enhancement_type_var.get()
             system_prompt = self.get_enhancement_system_prompt(enhancement_type)
+            backend = self.backend_var.get()
+            api_key = self.api_key_var.get() if backend in API_KEY_BACKENDS else None
             
             result = self.api.enhance_text_prompt(
                 model=model,
-                backend_type=self.backend_var.get(),
+                backend_type=backend,
                 prompt=text,
-                temperature=self.temperature_var.get(),
-                max_tokens=self.max_tokens_var.get(),
+                **params,
                 ollama_url=self.ollama_url_var.get(),
-                api_key=self.api_key_var.get() if self.backend_var.get() in ["openai", "openrouter"] else None,
+                api_key=api_key,
                 system_prompt=system_prompt
             )
             
             # Display result in text results text area
-            self.root.after(0, lambda: self.display_text_result(result))
+            self._ui_call(self.display_text_result, result)
             
         except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Text enhancement failed: {error_msg}"))
+            self._ui_call(messagebox.showerror, "Error", f"Text enhancement failed: {str(e)}")
         finally:
-            self.root.after(0, lambda: self.progress_label_var.set("Ready"))
-    
-    def display_result(self, operation, result):
-        """Display result in results tab"""
-        self.notebook.select(5)  # Switch to results tab
-        
-        timestamp = tk.datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        result_text = f"\n{'='*60}\n"
-        result_text += f"{operation} - {timestamp}\n"
-        result_text += f"{'='*60}\n"
-        
-        if isinstance(result, dict):
-            if "success" in result:
-                result_text += f"Success: {result['success']}\n"
-            if "message" in result:
-                result_text += f"Message: {result['message']}\n"
-            if "result" in result:
-                result_text += f"Result: {result['result']}\n"
-            if "processedCount" in result:
-                result_text += f"Processed: {result['processedCount']} images\n"
-            if "results" in result:
-                result_text += f"Results:\n{json.dumps(result['results'], indent=2)}\n"
-        else:
-            result_text += f"Result: {str(result)}\n"
-        
-        result_text += f"\n{'-'*60}\n"
-        
-        self.results_text.insert(tk.END, result_text)
-        self.results_text.see(tk.END)
-        
+            self._ui_progress("Ready")
     
     def display_batch_result(self, result):
         """Handle batch processing result"""
-        if not result.get('success'):
+        if not result.success:
             # Only show error popup for actual errors
-            error_msg = result.get('error', 'Unknown error occurred')
-            messagebox.showerror("Batch Processing Error", f"Error: {error_msg}")
+            messagebox.showerror("Batch Processing Error", f"Error: {result.message or 'Unknown error occurred'}")
     
     
     def display_text_result(self, result):
@@ -1600,16 +2418,15 @@ These settings apply globally to all tabs and operations.
         # Clear previous results
         self.text_results_text.delete(1.0, tk.END)
         
-        if result.get('success'):
-            if 'response' in result:
+        if result.success:
+            if result.response:
                 # Show only the LLM response
-                self.text_results_text.insert(tk.END, result['response'])
+                self.text_results_text.insert(tk.END, result.response)
             else:
                 self.text_results_text.insert(tk.END, "No enhanced text received.")
         else:
             # Show error message
-            error_msg = result.get('message', 'Unknown error occurred')
-            self.text_results_text.insert(tk.END, f"Error: {error_msg}")
+            self.text_results_text.insert(tk.END, f"Error: {result.message or 'Unknown error occurred'}")
         
         self.text_results_text.see(tk.END)
     
@@ -1623,166 +2440,13 @@ These settings apply globally to all tabs and operations.
     
     def get_enhancement_system_prompt(self, enhancement_type):
         """Get the system prompt for the selected enhancement type"""
-        if enhancement_type == "qwen":
-            return """# Qwen Prompt Enhancement System
-
-You are an expert prompt enhancement specialist designed to transform brief, basic prompts into rich, detailed, and comprehensive instructions that will produce superior results from AI image generation models.
-
-## Core Function
-
-Your primary role is to receive short, simple prompts from users and expand them into fully-fleshed, detailed prompts that include:
-- Rich visual descriptions
-- Technical specifications
-- Artistic direction
-- Contextual details
-- Quality enhancers
-- Style specifications
-
-## Enhancement Framework
-
-### Visual Detail Expansion
-**Transform basic subjects into rich descriptions:**
-- Simple: "a cat" 
-- Enhanced: "a majestic Maine Coon cat with luxurious silver-gray fur, piercing amber eyes, sitting regally with perfect posture, whiskers catching soft light"
-
-**Add environmental context:**
-- Specify lighting conditions (golden hour, studio lighting, natural daylight, dramatic shadows)
-- Include atmospheric elements (mist, rain, snow, dust particles, lens flares)
-- Describe backgrounds and settings in detail
-- Add weather and seasonal indicators
-
-### Technical Quality Specifications
-Always include technical parameters to ensure high-quality output:
-- **Resolution indicators:** "8K resolution," "ultra high definition," "crisp detail"
-- **Camera specifications:** "shot with professional DSLR," "50mm lens," "shallow depth of field"
-- **Lighting setup:** "three-point lighting," "soft box lighting," "natural window light"
-- **Composition rules:** "rule of thirds," "centered composition," "dynamic angle"
-
-### Artistic Style Integration
-Enhance prompts with specific artistic directions:
-- **Photography styles:** portrait, landscape, macro, street photography, documentary
-- **Artistic movements:** impressionistic, photorealistic, surreal, minimalist, baroque
-- **Color palettes:** warm tones, cool blues, monochromatic, vibrant saturated colors
-- **Mood descriptors:** serene, dramatic, mysterious, energetic, melancholic
-
-### Quality Enhancement Keywords
-Include power words that improve AI generation:
-- **Clarity enhancers:** "sharp focus," "crystal clear," "highly detailed," "intricate"
-- **Professional markers:** "award-winning," "masterpiece," "professional grade," "gallery quality"
-- **Texture descriptors:** "smooth," "rough," "glossy," "matte," "textured surface"
-- **Depth indicators:** "bokeh background," "layered composition," "foreground and background separation"
-
-## Enhancement Process
-
-### Step 1: Subject Analysis
-- Identify the core subject or concept
-- Determine the likely intent (artistic, commercial, documentary, etc.)
-- Assess what visual elements would enhance the concept
-
-### Step 2: Context Building
-- Add relevant environmental details
-- Include time of day/season if appropriate
-- Specify location or setting characteristics
-- Consider cultural or historical context
-
-### Step 3: Technical Specification
-- Add camera and lens specifications
-- Include lighting setup details
-- Specify composition guidelines
-- Add quality and resolution markers
-
-### Step 4: Artistic Direction
-- Define visual style and aesthetic
-- Add color palette guidance
-- Include mood and atmosphere descriptors
-- Specify any artistic influences or techniques
-
-### Step 5: Quality Assurance
-- Include professional quality indicators
-- Add detail enhancement keywords
-- Specify any technical perfection requirements
-- Include output format preferences
-
-## Enhancement Examples
-
-**Basic Prompt:** "sunset over mountains"
-**Enhanced Prompt:** "Breathtaking golden hour sunset over majestic snow-capped mountain peaks, dramatic cloud formations painted in brilliant oranges, purples, and magentas, alpine landscape with pristine lakes reflecting the colorful sky, shot with telephoto lens creating compressed perspective, professional landscape photography, award-winning composition following rule of thirds, crystal clear 8K detail, HDR lighting capturing full dynamic range, serene and awe-inspiring atmosphere"
-
-**Basic Prompt:** "woman reading"
-**Enhanced Prompt:** "Elegant woman in her thirties with flowing auburn hair, wearing a cream-colored cashmere sweater, peacefully reading a leather-bound book in a cozy library corner, warm afternoon sunlight streaming through tall windows creating gentle shadows, surrounded by towering mahogany bookshelves filled with classic literature, shot with 85mm portrait lens, shallow depth of field with beautiful bokeh, soft natural lighting, intimate and contemplative mood, photorealistic detail, professional portraiture style"
-
-## Output Format Requirements
-
-Structure enhanced prompts as single, flowing descriptions that include:
-1. **Main Subject** (detailed description)
-2. **Setting/Environment** (contextual details)
-3. **Lighting/Atmosphere** (mood and technical lighting)
-4. **Technical Specifications** (camera, quality, resolution)
-5. **Artistic Style** (aesthetic direction and mood)
-6. **Quality Enhancers** (professional markers and detail specifications)
-
-## Key Enhancement Principles
-
-### Specificity Over Generality
-- Replace vague terms with precise descriptors
-- Add measurable qualities (colors, sizes, textures)
-- Include specific rather than generic elements
-
-### Visual Richness
-- Layer multiple descriptive elements
-- Include sensory details that translate visually
-- Add elements that create depth and interest
-
-### Professional Standards
-- Include industry-standard terminology
-- Add technical specifications that matter
-- Reference professional photography/art concepts
-
-### Contextual Relevance
-- Ensure all additions serve the core concept
-- Maintain logical consistency throughout
-- Balance detail with focus on the main subject
-
-## Response Guidelines
-
-- Always expand significantly on the original prompt
-- Maintain the user's original intent while enriching it
-- Provide prompts that are immediately usable for image generation
-- Include diverse enhancement elements in every response
-- Structure the enhanced prompt for optimal AI interpretation
-- Balance technical precision with creative inspiration
-- Only respong with the enhanced prompt, do not respond with anything like "here is your enhanced prompt" or any other description"""
-
-        elif enhancement_type == "wan":
-            return """You are a motion prompt enhancement assistant for WAN 2.2 video generation. The user will give you a motion prompt describing what happens in the video. Do not add new elements or change the actions, characters, or events. Your task is to rewrite the prompt with clearer, more vivid, and more cinematic language so the video generation model can better capture the motion. Focus on fluidity, atmosphere, and visual clarity. Keep the sequence of actions identical to the user's original prompt. Respond only with the enhanced motion prompt—no explanations, lists, or meta commentary
-
-Now enhance the following motion prompt:"""
-        else:
-            return "Enhance the following text:"
+        return ENHANCE_SYSTEM_PROMPTS.get(enhancement_type, "Enhance the following text:")
     
     
     def save_settings(self):
         """Save application settings"""
-        # Update stored API keys based on current backend
-        current_backend = self.backend_var.get()
-        if current_backend == "openai":
-            self.openai_api_key = self.api_key_var.get()
-        elif current_backend == "openrouter":
-            self.openrouter_api_key = self.api_key_var.get()
-        elif current_backend == "textgen":
-            self.textgen_url = self.ollama_url_var.get()
-        
-        settings = {
-            "swarmui_url": self.swarmui_url_var.get(),
-            "backend": self.backend_var.get(),
-            "ollama_url": self.ollama_url_var.get(),
-            "api_key": self.api_key_var.get(),
-            "default_model": self.default_model_var.get(),
-            "session_id": self.session_id_var.get() if hasattr(self, 'session_id_var') else "",
-            # Save API keys for different backends
-            "openai_api_key": self.openai_api_key,
-            "openrouter_api_key": self.openrouter_api_key,
-            "textgen_url": self.textgen_url,
+        self._sync_connection_settings()
+        self._settings.update({
             # Global model settings
             "temperature": self.temperature_var.get(),
             "max_tokens": self.max_tokens_var.get(),
@@ -1794,21 +2458,44 @@ Now enhance the following motion prompt:"""
             "presence_penalty": self.presence_penalty_var.get(),
             "min_p": self.min_p_var.get(),
             "top_a": self.top_a_var.get()
-        }
+        })
         
         try:
-            with open("ollamavision_settings.json", 'w') as f:
-                json.dump(settings, f, indent=2)
+            self._write_settings()
             messagebox.showinfo("Success", "Settings saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
     
+    def _write_settings(self):
+        """Write the live settings to disk atomically, skipping the write if nothing changed"""
+        # Still write if the file was deleted since the last save
+        if self._settings == self._settings_shadow and os.path.exists(self.SETTINGS_FILE):
+            return False
+        
+        # Write to a temp file and swap it in so a crash never leaves a torn file
+        tmp_path = self.SETTINGS_FILE + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                # Sorted so the file's layout stays the same from save to save
+                f.write(_json_dumps(self._settings, indent=True, sort_keys=True))
+            os.replace(tmp_path, self.SETTINGS_FILE)
+        except OSError:
+            # Don't leave a half-written temp file behind
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._settings_shadow = dict(self._settings)
+        return True
+    
     def load_settings(self):
         """Load application settings"""
         try:
-            if os.path.exists("ollamavision_settings.json"):
-                with open("ollamavision_settings.json", 'r') as f:
-                    settings = json.load(f)
+            if os.path.exists(self.SETTINGS_FILE):
+                settings = _json_loads(Path(self.SETTINGS_FILE).read_bytes())
+                self._settings = settings
+                self._settings_shadow = dict(settings)
                 
                 self.swarmui_url_var.set(settings.get("swarmui_url", "http://localhost:7801"))
                 self.backend_var.set(settings.get("backend", "ollama"))
@@ -1848,17 +2535,20 @@ Now enhance the following motion prompt:"""
                 # Update connection button state
                 self.update_connection_button()
         except Exception as e:
-            print(f"Failed to load settings: {e}")
+            logger.warning("Failed to load settings: %s", e)
 
 def main():
     """Main function"""
+    # Set OLLAMAVISION_LOG=DEBUG to see debug output
+    level_name = (os.environ.get("OLLAMAVISION_LOG") or "WARNING").upper()
+    level = logging.getLevelName(level_name)  # An int for known names, a string otherwise
+    logging.basicConfig(level=level if isinstance(level, int) else logging.WARNING)
+    if not isinstance(level, int):
+        logger.warning("Unknown OLLAMAVISION_LOG level %r, using WARNING", level_name)
+    
     root = tk.Tk()
     app = OllamaVisionGUI(root)
     
-    # Add datetime import for timestamp
-    import datetime
-    tk.datetime = datetime
-    
     root.mainloop()
 
 if __name__ == "__main__":